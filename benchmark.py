@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+GitHub M&A Intelligence Benchmarks
+Wall-clock benchmarks of the collector against a local mock GitHub API server
+"""
+
+import sys
+import time
+import json
+import asyncio
+import logging
+import argparse
+import subprocess
+import multiprocessing
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+
+class MockGitHubHandler(BaseHTTPRequestHandler):
+    """Serves deterministic GitHub-shaped payloads with a fixed latency"""
+
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+    latency = 0.02
+    contributors_per_repo = 100
+
+    def do_GET(self):
+        time.sleep(self.latency)
+        path = urlparse(self.path).path.strip('/').split('/')
+
+        if path[0] == 'users' and len(path) == 2:
+            body = {
+                'login': path[1],
+                'company': 'Example Corp',
+                'location': 'Earth',
+                'hireable': False,
+                'public_repos': 10,
+                'followers': 100,
+                'following': 5,
+                'created_at': '2015-01-01T00:00:00Z'
+            }
+        elif path[0] == 'repos' and len(path) == 4 and path[3] == 'contributors':
+            body = [
+                {'login': f'{path[2]}-user{i}', 'contributions': self.contributors_per_repo - i}
+                for i in range(self.contributors_per_repo)
+            ]
+        else:
+            self.send_response(404)
+            self.end_headers()
+            return
+
+        payload = json.dumps(body).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+def _serve(latency: float, port_queue):
+    MockGitHubHandler.latency = latency
+    ThreadingHTTPServer.request_queue_size = 128
+    server = ThreadingHTTPServer(('127.0.0.1', 0), MockGitHubHandler)
+    server.daemon_threads = True
+    port_queue.put(server.server_address[1])
+    server.serve_forever()
+
+def start_mock_server(latency: float):
+    """Start the mock GitHub server in its own process so it doesn't share the client's GIL"""
+    port_queue = multiprocessing.Queue()
+    process = multiprocessing.Process(target=_serve, args=(latency, port_queue), daemon=True)
+    process.start()
+    return process, f'http://127.0.0.1:{port_queue.get()}'
+
+def benchmark_enrichment(base_url: str, repos: int, workers: int) -> float:
+    """Time contributor enrichment for `repos` repositories"""
+    from github_data_collector import GitHubAPIClient
+
+    client = GitHubAPIClient(token='benchmark', base_url=base_url, max_workers=workers)
+
+    start = time.perf_counter()
+    for i in range(repos):
+        contributors = client.get_repository_contributors('bench', f'repo{i}')
+        assert len(contributors) == MockGitHubHandler.contributors_per_repo
+        assert contributors[0].username == f'repo{i}-user0'
+    return time.perf_counter() - start
+
+def run_enrichment(args):
+    """Compare serial and concurrent contributor enrichment"""
+    server, base_url = start_mock_server(args.latency)
+    requests_made = args.repos * (MockGitHubHandler.contributors_per_repo + 1)
+
+    print(f"Contributor enrichment: {args.repos} repos x {MockGitHubHandler.contributors_per_repo} "
+          f"contributors, {args.latency * 1000:.0f}ms latency")
+
+    try:
+        for workers in (1, args.workers):
+            elapsed = benchmark_enrichment(base_url, args.repos, workers)
+            print(f"  workers={workers:<3} {elapsed:8.2f}s  {requests_made / elapsed:8.1f} req/s")
+    finally:
+        server.terminate()
+
+def benchmark_async_enrichment(base_url: str, repos: int, concurrency: int) -> float:
+    """Time contributor enrichment for `repos` repositories with the async client"""
+    from github_async_client import AsyncGitHubAPIClient
+
+    async def enrich() -> float:
+        # The mock server speaks HTTP/1.1 only
+        async with AsyncGitHubAPIClient(token='benchmark', base_url=base_url,
+                                        max_concurrency=concurrency, http2=False) as client:
+            start = time.perf_counter()
+            results = await asyncio.gather(*(
+                client.get_repository_contributors('bench', f'repo{i}') for i in range(repos)
+            ))
+            elapsed = time.perf_counter() - start
+
+        for i, contributors in enumerate(results):
+            assert len(contributors) == MockGitHubHandler.contributors_per_repo
+            assert contributors[0].username == f'repo{i}-user0'
+        return elapsed
+
+    return asyncio.run(enrich())
+
+def run_async(args):
+    """Compare the threaded client with the async client"""
+    server, base_url = start_mock_server(args.latency)
+    requests_made = args.repos * (MockGitHubHandler.contributors_per_repo + 1)
+
+    print(f"Threaded vs async enrichment: {args.repos} repos x {MockGitHubHandler.contributors_per_repo} "
+          f"contributors, {args.latency * 1000:.0f}ms latency")
+
+    try:
+        elapsed = benchmark_enrichment(base_url, args.repos, args.workers)
+        print(f"  threaded workers={args.workers:<3}  {elapsed:8.2f}s  {requests_made / elapsed:8.1f} req/s")
+        elapsed = benchmark_async_enrichment(base_url, args.repos, args.concurrency)
+        print(f"  async concurrency={args.concurrency:<3} {elapsed:8.2f}s  {requests_made / elapsed:8.1f} req/s")
+    finally:
+        server.terminate()
+
+# Modules each entry point imports before doing any work
+STARTUP_TARGETS = {
+    'api-server': 'import github_api_server',
+    'cli-analyze': 'import main, github_ml_analyzer'
+}
+
+def benchmark_startup(statement: str) -> dict:
+    """Cold-start a fresh interpreter with -X importtime and summarize where import time went"""
+    code = f"{statement}; import resource; print(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)"
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', code], capture_output=True, text=True)
+    elapsed = time.perf_counter() - start
+
+    if result.returncode:
+        return {'error': result.stderr.strip().splitlines()[-1]}
+
+    # Lines read "import time: <self us> | <cumulative us> | <module>", with
+    # the module indented two spaces per nesting level
+    top_level, dependencies = [], []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, module = line[len('import time:'):].split('|')
+        depth = (len(module) - len(module.lstrip()) - 1) // 2
+        if depth == 0:
+            top_level.append(int(cumulative) / 1e6)
+        if depth <= 1:
+            dependencies.append((int(cumulative) / 1e6, module.strip()))
+
+    return {
+        'wall_seconds': elapsed,
+        'import_seconds': sum(top_level),
+        'max_rss_mb': int(result.stdout.split()[-1]) / 1024,
+        'slowest_imports': sorted(dependencies, reverse=True)[:10]
+    }
+
+def run_startup(args):
+    """Measure cold-start import cost of the API server and the CLI"""
+    results = {}
+    for target, statement in STARTUP_TARGETS.items():
+        # Best of several runs, so a cold disk cache doesn't skew the numbers
+        runs = [benchmark_startup(statement) for _ in range(args.runs)]
+        results[target] = min(runs, key=lambda run: run.get('wall_seconds', float('inf')))
+
+    print(f"Startup import time (best of {args.runs}, python -X importtime)")
+    for target, result in results.items():
+        if 'error' in result:
+            print(f"  {target:<12} failed: {result['error']}")
+            continue
+
+        print(f"  {target:<12} {result['wall_seconds']:6.2f}s wall  {result['import_seconds']:6.2f}s imports  "
+              f"{result['max_rss_mb']:7.1f} MB max RSS")
+        for seconds, module in result['slowest_imports'][:5]:
+            print(f"    {seconds:6.3f}s  {module}")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'), 'python': sys.version.split()[0],
+                       'results': results}, f, indent=2)
+        print(f"Results recorded in {args.output}")
+
+def main():
+    """Benchmark CLI entry point"""
+    parser = argparse.ArgumentParser(description='GitHub M&A Intelligence benchmarks')
+    subparsers = parser.add_subparsers(dest='benchmark', required=True)
+
+    enrichment = subparsers.add_parser('enrichment', help='Serial vs concurrent contributor enrichment')
+    enrichment.add_argument('--repos', type=int, default=20, help='Repositories to enrich (default: 20)')
+    enrichment.add_argument('--workers', type=int, default=16, help='Concurrent workers (default: 16)')
+    enrichment.add_argument('--latency', type=float, default=0.02,
+                            help='Mock server latency in seconds (default: 0.02)')
+    enrichment.set_defaults(func=run_enrichment)
+
+    async_ = subparsers.add_parser('async', help='Threaded vs async contributor enrichment')
+    async_.add_argument('--repos', type=int, default=20, help='Repositories to enrich (default: 20)')
+    async_.add_argument('--workers', type=int, default=16, help='Threaded client workers (default: 16)')
+    async_.add_argument('--concurrency', type=int, default=16,
+                        help='Async client concurrency (default: 16)')
+    async_.add_argument('--latency', type=float, default=0.02,
+                        help='Mock server latency in seconds (default: 0.02)')
+    async_.set_defaults(func=run_async)
+
+    startup = subparsers.add_parser('startup', help='Cold-start import time of the API server and the CLI')
+    startup.add_argument('--runs', type=int, default=3, help='Runs per entry point (default: 3)')
+    startup.add_argument('--output', help='Also record the results in this JSON file')
+    startup.set_defaults(func=run_startup)
+
+    args = parser.parse_args()
+
+    # Keep per-repository collector logging out of the results
+    logging.getLogger('github_data_collector').setLevel(logging.WARNING)
+    logging.getLogger('github_async_client').setLevel(logging.WARNING)
+    logging.getLogger('httpx').setLevel(logging.WARNING)
+    args.func(args)
+
+if __name__ == '__main__':
+    main()
@@ -226,6 +226,10 @@ CREATE INDEX IF NOT EXISTS idx_repositories_updated_at ON repositories(updated_a
 CREATE INDEX IF NOT EXISTS idx_repository_snapshots_repo_date ON repository_snapshots(repository_id, snapshot_date DESC);
 CREATE INDEX IF NOT EXISTS idx_repository_snapshots_date ON repository_snapshots(snapshot_date DESC);
 
+-- One snapshot per repository per collection run. Databases created before this
+-- index existed may hold duplicates; run migrations/001_unique_repository_snapshots.sql once
+CREATE UNIQUE INDEX IF NOT EXISTS idx_repository_snapshots_run ON repository_snapshots(repository_id, snapshot_date);
+
 CREATE INDEX IF NOT EXISTS idx_contributors_company ON contributors(company);
 CREATE INDEX IF NOT EXISTS idx_contributors_location ON contributors(location);
 
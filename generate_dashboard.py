@@ -20,6 +20,9 @@ HEADERS = {
     'Accept': 'application/vnd.github.v3+json'
 }
 
+# Snapshot columns the charts and the index page read
+DASHBOARD_COLUMNS = {'repositories': ['name', 'full_name', 'owner', 'stars', 'forks', 'language']}
+
 # Create directories
 os.makedirs('charts', exist_ok=True)
 
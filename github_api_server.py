@@ -6,6 +6,7 @@ Provides endpoints for accessing intelligence data and analysis results
 
 import os
 import json
+import asyncio
 import logging
 from datetime import datetime, timedelta
 from flask import Flask, jsonify, request, send_from_directory
@@ -37,6 +38,10 @@ redis_client = redis.Redis(host='localhost', port=6379, db=0, decode_responses=T
 
 # Import our modules
 from github_data_collector import GitHubAPIClient, DataCollector
+from github_state import CollectionState
+from github_events import load_watchlist
+from github_storage import CollectionStore
+from github_snapshots import save_collection_snapshot
 from github_ml_analyzer import MLAnalyzer
 
 class APIError(Exception):
@@ -65,8 +70,17 @@ class IntelligenceAPI:
 
     def __init__(self):
         self.api_client = GitHubAPIClient()
-        self.collector = DataCollector(self.api_client)
+        self.collector = DataCollector(
+            self.api_client,
+            CollectionState(os.getenv('COLLECTION_STATE_PATH', 'data/collection_state.json'))
+        )
         self.analyzer = MLAnalyzer()
+        try:
+            # Saved models are memory-mapped; training happens only if the data changed
+            self.analyzer.load_historical_data()
+        except Exception as e:
+            logger.error(f"Failed to load ML models: {e}")
+        self.store = CollectionStore.from_env()
         self.data_cache_timeout = 300  # 5 minutes
         self.analysis_cache_timeout = 600  # 10 minutes
 
@@ -92,29 +106,42 @@ class IntelligenceAPI:
         logger.info("Collecting fresh data from GitHub API")
 
         try:
-            # Collect repositories
-            repositories = self.collector.collect_top_repositories(min_stars=10000)
-
-            # Collect contributor patterns
-            contributor_patterns = self.collector.collect_contributor_patterns(repositories)
+            watchlist = load_watchlist()
+
+            if os.getenv('GITHUB_ASYNC_COLLECTION', 'false').lower() == 'true':
+                # Overlap all collection phases on a single event loop
+                repositories, contributor_patterns, commit_activity, activities = asyncio.run(
+                    self.collect_async(min_stars=10000, organizations=watchlist)
+                )
+            else:
+                # Collect repositories and contributor patterns
+                if os.getenv('GITHUB_COLLECTION_MODE', 'rest').lower() == 'graphql':
+                    repositories, contributor_patterns = self.collector.collect_repositories_graphql(min_stars=10000)
+                else:
+                    repositories = self.collector.collect_top_repositories(min_stars=10000)
+                    contributor_patterns = self.collector.collect_contributor_patterns(repositories)
+
+                # Collect commits made since the last run
+                commit_activity = self.collector.collect_commit_activity(repositories)
+
+                # Collect organization activities
+                activities = self.collector.collect_recent_activity(watchlist)
 
             # Detect transfer events
             transfer_events = self.collector.detect_ownership_changes(repositories)
 
-            # Collect organization activities
-            key_orgs = ['microsoft', 'google', 'meta', 'amazon', 'apple', 'netflix']
-            activities = self.collector.collect_recent_activity(key_orgs)
-
             # Prepare data structure
             data = {
                 'timestamp': datetime.now().isoformat(),
                 'repositories': [vars(repo) for repo in repositories],
                 'contributor_patterns': {k: [vars(c) for c in v] for k, v in contributor_patterns.items()},
+                'commit_activity': {k: [vars(c) for c in v] for k, v in commit_activity.items()},
                 'transfer_events': [vars(event) for event in transfer_events],
                 'organization_activities': activities,
                 'metadata': {
                     'total_repositories': len(repositories),
                     'total_contributors_analyzed': sum(len(c) for c in contributor_patterns.values()),
+                    'new_commits': sum(len(c) for c in commit_activity.values()),
                     'transfer_events_detected': len(transfer_events),
                     'organizations_monitored': len(activities)
                 }
@@ -123,19 +150,50 @@ class IntelligenceAPI:
             # Cache the data
             self.set_cached_data('current_data', data)
 
-            # Save to file for persistence
-            os.makedirs('data', exist_ok=True)
-            filename = f"data/{datetime.now().strftime('%Y%m%d_%H%M%S')}_api_data.json"
-            with open(filename, 'w') as f:
-                json.dump(data, f, indent=2, default=str)
+            # Save a snapshot for persistence
+            save_collection_snapshot(data, 'api_data')
+
+            # Upsert the run into the database too, when one is configured
+            if self.store:
+                try:
+                    self.store.save_collection(data)
+                except Exception as e:
+                    logger.error(f"Failed to persist collection to the database: {e}")
 
             logger.info(f"Fresh data collected and cached: {len(repositories)} repositories")
+
+            request_stats = self.api_client.get_request_stats()
+            logger.info(f"GitHub requests: {request_stats['requests']} total, "
+                        f"{request_stats['not_modified_ratio']:.0%} answered 304 Not Modified")
             return data
 
         except Exception as e:
             logger.error(f"Data collection failed: {e}")
             raise APIError("Failed to collect data from GitHub API", 500)
 
+    async def collect_async(self, min_stars, organizations):
+        """Run one collection cycle with the async client, sharing caches, credentials and state"""
+        # httpx is optional; it is only needed when GITHUB_ASYNC_COLLECTION is on
+        from github_async_client import AsyncGitHubAPIClient, AsyncDataCollector
+
+        async with AsyncGitHubAPIClient(
+            base_url=self.api_client.base_url,
+            user_cache=self.api_client.user_cache,
+            validator_cache=self.api_client.validator_cache,
+            commit_stats_cache=self.api_client.commit_stats_cache,
+            credentials=self.api_client.credentials,
+            retry_policy=self.api_client.retry_policy,
+            circuit_breakers=self.api_client.circuit_breakers
+        ) as client:
+            commit_backend = None if self.collector.commit_backend is self.api_client else self.collector.commit_backend
+            collector = AsyncDataCollector(client, self.collector.state, commit_backend)
+
+            # Keep event polling schedules and the polling budget across cycles
+            client.poll_intervals = self.api_client.poll_intervals
+            collector.event_ingester = self.collector.event_ingester
+            collector.marks = self.collector.marks
+            return await collector.collect_all(min_stars, organizations)
+
     def perform_ml_analysis(self, data):
         """Perform ML analysis on the data"""
         logger.info("Performing ML analysis")
@@ -399,6 +457,7 @@ def get_stats():
             'acquisition_predictions': len(analysis.get('acquisition_predictions', [])) if analysis else 0,
             'transfer_events': len(data.get('transfer_events', [])) if data else 0,
             'last_update': data.get('timestamp') if data else None,
+            'github_requests': intelligence_api.api_client.get_request_stats(),
             'cache_status': 'healthy' if redis_client.ping() else 'unhealthy'
         }
 
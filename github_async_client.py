@@ -0,0 +1,549 @@
+#!/usr/bin/env python3
+"""
+GitHub M&A Intelligence Async Data Collector
+asyncio-native GitHub client with connection pooling, keep-alive and optional HTTP/2
+"""
+
+import os
+import time
+import asyncio
+import logging
+from datetime import datetime
+from dataclasses import asdict
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+import httpx
+from github_auth import CredentialPool
+from github_cache import UserProfileCache, ValidatorCache, CommitStatsCache
+from github_resilience import RetryPolicy, HostCircuitBreakers, CircuitOpenError
+from github_data_collector import (
+    DataCollector, RepositoryData, ContributorData, CommitData,
+    repository_from_payload, contributor_from_payload, commit_from_payload
+)
+
+logger = logging.getLogger(__name__)
+
+class AsyncGitHubAPIClient:
+    """Async GitHub API client with the same method surface as GitHubAPIClient"""
+
+    def __init__(self, token: Optional[str] = None, base_url: Optional[str] = None,
+                 max_concurrency: Optional[int] = None, http2: Optional[bool] = None,
+                 user_cache: Optional[UserProfileCache] = None,
+                 validator_cache: Optional[ValidatorCache] = None,
+                 commit_stats_cache: Optional[CommitStatsCache] = None,
+                 credentials: Optional[CredentialPool] = None,
+                 retry_policy: Optional[RetryPolicy] = None,
+                 circuit_breakers: Optional[HostCircuitBreakers] = None):
+        self.token = token or os.getenv('GITHUB_TOKEN')
+        self.base_url = (base_url or os.getenv('GITHUB_API_BASE_URL', 'https://api.github.com')).rstrip('/')
+        self.max_concurrency = max(1, max_concurrency or int(os.getenv('GITHUB_ASYNC_CONCURRENCY', 32)))
+        if http2 is None:
+            http2 = os.getenv('GITHUB_HTTP2', 'true').lower() == 'true'
+
+        # Caches, credentials and resilience state can be shared with a GitHubAPIClient
+        self.credentials = credentials or CredentialPool.from_env(token, self.base_url)
+        self.user_cache = user_cache or UserProfileCache(
+            ttl_seconds=float(os.getenv('USER_CACHE_TTL_SECONDS', 86400)),
+            max_size=int(os.getenv('USER_CACHE_MAX_SIZE', 10000)),
+            db_path=os.getenv('USER_CACHE_PATH') or None
+        )
+        self.validator_cache = validator_cache or ValidatorCache(
+            max_entries=int(os.getenv('HTTP_CACHE_MAX_ENTRIES', 2000))
+        )
+        self.commit_stats_cache = commit_stats_cache or CommitStatsCache(
+            max_size=int(os.getenv('COMMIT_STATS_CACHE_MAX_SIZE', 100000)),
+            db_path=os.getenv('COMMIT_STATS_CACHE_PATH') or None
+        )
+        self.commit_stats_mode = os.getenv('GITHUB_COMMIT_STATS_MODE', 'graphql').lower()
+        self.commit_stats_batch_size = 100
+
+        self.poll_intervals = {}  # url -> seconds GitHub asks us to wait between polls
+
+        # Bounded fan-out over a pooled, keep-alive connection set
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._pending_users = {}  # login -> in-flight profile request
+        self.client = httpx.AsyncClient(
+            http2=http2,
+            headers={'Accept': 'application/vnd.github.v3+json'},
+            limits=httpx.Limits(
+                max_connections=self.max_concurrency,
+                max_keepalive_connections=self.max_concurrency,
+                keepalive_expiry=30
+            ),
+            timeout=httpx.Timeout(float(os.getenv('GITHUB_READ_TIMEOUT', 30)),
+                                  connect=float(os.getenv('GITHUB_CONNECT_TIMEOUT', 5)))
+        )
+
+        # Retries of transient failures, and fail-fast when GitHub is degraded
+        self.retry_policy = retry_policy or RetryPolicy.from_env()
+        self.circuit_breakers = circuit_breakers or HostCircuitBreakers.from_env()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+
+    async def aclose(self):
+        await self.client.aclose()
+
+    async def _send(self, method: str, url: str, headers: Optional[Dict] = None,
+                    rate_limited: bool = True, **kwargs) -> httpx.Response:
+        """Send an authorized request with timeouts, jittered retries and the host's circuit breaker"""
+        breaker = self.circuit_breakers.for_url(url)
+        attempt = 0
+
+        while True:
+            if not breaker.allow():
+                raise CircuitOpenError(f"Circuit open for {urlparse(url).netloc}, not sending {method} {url}")
+
+            # Pick a credential and wait for its rate limit slot
+            credential = self.credentials.select()
+            delay = credential.governor.reserve_slot()
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+            request_headers = dict(headers or {})
+            authorization = credential.authorization_header()
+            if authorization:
+                request_headers['Authorization'] = authorization
+
+            try:
+                async with self._semaphore:
+                    response = await self.client.request(method, url, headers=request_headers, **kwargs)
+            except (httpx.TransportError, httpx.TimeoutException) as e:
+                self.circuit_breakers.record(url, None)
+                delay = self.retry_policy.retry_delay(attempt)
+                if delay is None:
+                    raise
+                logger.warning(f"{method} {url} failed ({e}), retrying in {delay:.1f}s")
+            else:
+                if rate_limited:
+                    credential.governor.update(response.headers, response.status_code)
+                elif 'Retry-After' in response.headers:
+                    credential.governor.update({'Retry-After': response.headers['Retry-After']})
+                self.circuit_breakers.record(url, response.status_code)
+
+                delay = self.retry_policy.retry_delay(attempt, response.status_code, response.headers)
+                if delay is None:
+                    return response
+                logger.warning(f"{method} {url} returned {response.status_code}, retrying in {delay:.1f}s")
+
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    async def _fetch(self, url: str, params: Optional[Dict] = None) -> Tuple[Optional[Dict], Optional[str]]:
+        """Make rate-limited conditional request; returns the body and the Link rel="next" URL"""
+        cache_key = self.validator_cache.key(url, params)
+        cached = self.validator_cache.get(cache_key)
+        headers = self.validator_cache.conditional_headers(cached)
+
+        try:
+            response = await self._send('GET', url, headers, params=params)
+            # Unlike requests, httpx raises on 304 Not Modified, so only raise on errors
+            if response.is_error:
+                response.raise_for_status()
+
+            # Event feeds say how often they may be polled
+            if 'X-Poll-Interval' in response.headers:
+                self.poll_intervals[url] = float(response.headers['X-Poll-Interval'])
+
+            if response.status_code == 304 and cached:
+                self.validator_cache.record(conditional=True, not_modified=True)
+                return cached['body'], cached['next_url']
+
+            data = response.json()
+            next_url = response.links.get('next', {}).get('url')
+            self.validator_cache.set(cache_key, response.headers.get('ETag'),
+                                     response.headers.get('Last-Modified'), data, next_url)
+            self.validator_cache.record(conditional=cached is not None, not_modified=False)
+            return data, next_url
+        except (httpx.HTTPError, CircuitOpenError) as e:
+            logger.error(f"API request failed: {e}")
+            return None, None
+
+    async def _make_request(self, url: str, params: Optional[Dict] = None) -> Optional[Dict]:
+        """Make rate-limited conditional request to GitHub API"""
+        return (await self._fetch(url, params))[0]
+
+    async def _paginate(self, url: str, params: Optional[Dict] = None, max_items: Optional[int] = None,
+                        items_key: Optional[str] = None) -> AsyncIterator[Dict]:
+        """Yield items page by page, following Link rel="next" only while more are wanted"""
+        params = dict(params or {})
+        params['per_page'] = min(100, max_items) if max_items else 100
+        yielded = 0
+
+        while url and (max_items is None or yielded < max_items):
+            data, next_url = await self._fetch(url, params)
+            if not data:
+                return
+
+            items = data.get(items_key, []) if items_key else data
+            for item in items:
+                yield item
+                yielded += 1
+                if max_items is not None and yielded >= max_items:
+                    return
+
+            # The next URL already carries the query string
+            url, params = next_url, None
+
+    def get_request_stats(self) -> Dict[str, float]:
+        """Request metrics, including the share of free 304 Not Modified responses"""
+        return {
+            **self.validator_cache.stats(),
+            **self.retry_policy.stats(),
+            'rate_limit_remaining': self.credentials.remaining,
+            'credentials': self.credentials.quota(),
+            'circuit_breakers': self.circuit_breakers.stats(),
+            'commit_stats_cache': self.commit_stats_cache.stats()
+        }
+
+    async def graphql(self, query: str, variables: Optional[Dict] = None) -> Optional[Dict]:
+        """Run a GraphQL query and return its data"""
+        try:
+            # GraphQL has its own point-based quota; only honor secondary limits here
+            response = await self._send('POST', f'{self.base_url}/graphql', rate_limited=False,
+                                        json={'query': query, 'variables': variables or {}})
+            if response.is_error:
+                response.raise_for_status()
+
+            payload = response.json()
+            if payload.get('errors'):
+                logger.error(f"GraphQL query returned errors: {payload['errors']}")
+            return payload.get('data')
+        except (httpx.HTTPError, CircuitOpenError) as e:
+            logger.error(f"GraphQL request failed: {e}")
+            return None
+
+    def iter_top_repositories(self, language: Optional[str] = None, min_stars: int = 1000,
+                              max_items: Optional[int] = None) -> AsyncIterator[Dict]:
+        """Stream top repositories by stars"""
+        query = f'stars:>{min_stars} sort:stars-desc'
+        if language:
+            query += f' language:{language}'
+
+        url = f'{self.base_url}/search/repositories'
+        return self._paginate(url, {'q': query}, max_items, items_key='items')
+
+    async def get_top_repositories(self, language: Optional[str] = None, min_stars: int = 1000,
+                                   max_items: int = 100) -> List[Dict]:
+        """Get top repositories by stars"""
+        return [repo async for repo in self.iter_top_repositories(language, min_stars, max_items)]
+
+    async def get_repository_details(self, owner: str, repo: str) -> Optional[RepositoryData]:
+        """Get detailed repository information"""
+        data = await self._make_request(f'{self.base_url}/repos/{owner}/{repo}')
+        return repository_from_payload(data) if data else None
+
+    async def iter_repository_contributors(self, owner: str, repo: str,
+                                           max_items: Optional[int] = None) -> AsyncIterator[ContributorData]:
+        """Stream repository contributors, enriching each page of them concurrently"""
+        url = f'{self.base_url}/repos/{owner}/{repo}/contributors'
+        page = []
+
+        async for contributor in self._paginate(url, {'anon': 'false'}, max_items):
+            page.append(contributor)
+            if len(page) == 100:
+                for item in await self._enrich(page):
+                    yield item
+                page = []
+
+        for item in await self._enrich(page):
+            yield item
+
+    async def _enrich(self, raw_contributors: List[Dict]) -> List[ContributorData]:
+        user_details = await self.get_users_details([c['login'] for c in raw_contributors])
+        return [
+            contributor_from_payload(contributor, user_data)
+            for contributor, user_data in zip(raw_contributors, user_details)
+            if user_data
+        ]
+
+    async def get_repository_contributors(self, owner: str, repo: str,
+                                          max_contributors: int = 100) -> List[ContributorData]:
+        """Get repository contributors"""
+        return [c async for c in self.iter_repository_contributors(owner, repo, max_contributors)]
+
+    async def get_user_details(self, username: str) -> Optional[Dict]:
+        """Get detailed user information"""
+        cached = self.user_cache.get(username)
+        if cached is not None:
+            return cached
+
+        # Contributors overlap across repositories; share one request per login
+        pending = self._pending_users.get(username)
+        if pending is None:
+            pending = asyncio.ensure_future(self._make_request(f'{self.base_url}/users/{username}'))
+            self._pending_users[username] = pending
+            pending.add_done_callback(lambda _: self._pending_users.pop(username, None))
+
+        user_data = await asyncio.shield(pending)
+        if user_data:
+            self.user_cache.set(username, user_data)
+        return user_data
+
+    async def get_users_details(self, usernames: List[str]) -> List[Optional[Dict]]:
+        """Get user information for several users concurrently, in input order"""
+        return list(await asyncio.gather(*(self.get_user_details(u) for u in usernames)))
+
+    async def iter_repository_commits(self, owner: str, repo: str, since: Optional[str] = None,
+                                      max_items: Optional[int] = None) -> AsyncIterator[CommitData]:
+        """Stream repository commits, newest first"""
+        url = f'{self.base_url}/repos/{owner}/{repo}/commits'
+        params = {'since': since} if since else {}
+
+        async for commit in self._paginate(url, params, max_items):
+            if commit.get('author') and commit.get('commit'):
+                yield commit_from_payload(commit)
+
+    async def get_repository_commits(self, owner: str, repo: str, since: Optional[str] = None,
+                                     max_items: Optional[int] = 100) -> List[CommitData]:
+        """Get repository commits"""
+        return [c async for c in self.iter_repository_commits(owner, repo, since, max_items)]
+
+    async def get_commit_stats(self, owner: str, repo: str, shas: List[str]) -> Dict[str, Tuple[int, int, int]]:
+        """(additions, deletions, files_changed) per commit SHA, fetching each SHA at most once"""
+        stats = self.commit_stats_cache.get_many(list(dict.fromkeys(shas)))
+        missing = [sha for sha in dict.fromkeys(shas) if sha not in stats]
+
+        async def fetch_batch(batch: List[str]) -> Dict[str, Tuple[int, int, int]]:
+            fetched = await self._graphql_commit_stats(owner, repo, batch) if self.commit_stats_mode == 'graphql' else {}
+
+            # Commits GraphQL couldn't diff (or every commit, in REST mode) take one call each
+            remaining = [sha for sha in batch if sha not in fetched]
+            results = await asyncio.gather(*(self._rest_commit_stats(owner, repo, sha) for sha in remaining))
+            fetched.update({sha: s for sha, s in zip(remaining, results) if s})
+
+            self.commit_stats_cache.set_many(fetched)
+            return fetched
+
+        batches = [missing[i:i + self.commit_stats_batch_size]
+                   for i in range(0, len(missing), self.commit_stats_batch_size)]
+        for fetched in await asyncio.gather(*(fetch_batch(batch) for batch in batches)):
+            stats.update(fetched)
+        return stats
+
+    async def _graphql_commit_stats(self, owner: str, repo: str, shas: List[str]) -> Dict[str, Tuple[int, int, int]]:
+        from github_graphql import commit_stats_query, commit_stats_from_data
+
+        variables = {'owner': owner, 'name': repo, **{f'sha{i}': sha for i, sha in enumerate(shas)}}
+        data = await self.graphql(commit_stats_query(len(shas)), variables)
+        return commit_stats_from_data(data) if data else {}
+
+    async def _rest_commit_stats(self, owner: str, repo: str, sha: str) -> Optional[Tuple[int, int, int]]:
+        # Commit bodies include patches and never change, so skip the validator cache
+        try:
+            response = await self._send('GET', f'{self.base_url}/repos/{owner}/{repo}/commits/{sha}')
+            if response.is_error:
+                response.raise_for_status()
+            data = response.json()
+            return data['stats']['additions'], data['stats']['deletions'], len(data.get('files', []))
+        except (httpx.HTTPError, CircuitOpenError, KeyError) as e:
+            logger.error(f"Failed to fetch stats for {owner}/{repo}@{sha[:7]}: {e}")
+            return None
+
+    async def fill_commit_stats(self, owner: str, repo: str, commits: List[CommitData]) -> List[CommitData]:
+        """Fill additions, deletions and files_changed of commits in place"""
+        stats = await self.get_commit_stats(owner, repo, [commit.sha for commit in commits])
+        for commit in commits:
+            if commit.sha in stats:
+                commit.additions, commit.deletions, commit.files_changed = stats[commit.sha]
+        return commits
+
+    async def iter_organization_events(self, org: str, event_type: Optional[str] = None,
+                                       max_items: Optional[int] = None) -> AsyncIterator[Dict]:
+        """Stream organization events, newest first"""
+        url = f'{self.base_url}/orgs/{org}/events'
+        yielded = 0
+
+        async for event in self._paginate(url, max_items=None if event_type else max_items):
+            if event_type and event['type'] != event_type:
+                continue
+            yield event
+            yielded += 1
+            if max_items is not None and yielded >= max_items:
+                return
+
+    async def get_organization_events(self, org: str, event_type: Optional[str] = None,
+                                      max_items: int = 100) -> List[Dict]:
+        """Get organization events"""
+        return [e async for e in self.iter_organization_events(org, event_type, max_items)]
+
+    def iter_search_repositories(self, query: str, sort: str = 'stars', order: str = 'desc',
+                                 max_items: Optional[int] = None) -> AsyncIterator[Dict]:
+        """Stream repositories matching a custom query"""
+        url = f'{self.base_url}/search/repositories'
+        params = {
+            'q': query,
+            'sort': sort,
+            'order': order
+        }
+        return self._paginate(url, params, max_items, items_key='items')
+
+    async def search_repositories(self, query: str, sort: str = 'stars', order: str = 'desc',
+                                  max_items: int = 100) -> List[Dict]:
+        """Search repositories with custom query"""
+        return [repo async for repo in self.iter_search_repositories(query, sort, order, max_items)]
+
+class AsyncDataCollector(DataCollector):
+    """Async variant of DataCollector that fans out across repositories and organizations"""
+
+    def __init__(self, api_client: AsyncGitHubAPIClient, state=None, commit_backend=None):
+        super().__init__(api_client, state, commit_backend)
+
+    async def collect_top_repositories(self, min_stars: int = 5000, max_repositories: int = 50,
+                                       details_max_age: Optional[float] = None) -> List[RepositoryData]:
+        """Collect data from top repositories, hydrated from search results where possible"""
+        logger.info(f"Collecting top repositories with {min_stars}+ stars")
+
+        raw_repos = [r async for r in self.api_client.iter_top_repositories(min_stars=min_stars,
+                                                                            max_items=max_repositories)]
+
+        async def hydrate(raw_repo: Dict) -> Optional[RepositoryData]:
+            try:
+                if not self._needs_details(raw_repo, details_max_age):
+                    return repository_from_payload(raw_repo)
+
+                owner, repo_name = raw_repo['full_name'].split('/')
+                repo_data = await self.api_client.get_repository_details(owner, repo_name)
+                if repo_data:
+                    self.marks.set_details_fetched_at(raw_repo['full_name'], time.time())
+                return repo_data
+            except Exception as e:
+                logger.error(f"Error collecting data for {raw_repo['full_name']}: {e}")
+                return None
+
+        repositories = [r for r in await asyncio.gather(*(hydrate(r) for r in raw_repos)) if r]
+        logger.info(f"Collected data for {len(repositories)} repositories")
+        self.marks.save()
+
+        self.collection_timestamp = datetime.now()
+        return repositories
+
+    async def collect_contributor_patterns(self, repositories: List[RepositoryData]
+                                           ) -> Dict[str, List[ContributorData]]:
+        """Collect contributor patterns for repositories"""
+        logger.info("Collecting contributor patterns")
+        self.api_client.user_cache.reset_stats()
+
+        async def collect(repo: RepositoryData) -> Optional[List[ContributorData]]:
+            try:
+                # Contributors only change with pushes; reuse the last run's list
+                if self.state and self.state.is_current(repo.full_name, 'contributors', repo.pushed_at):
+                    return [ContributorData(**c) for c in self.state.get_contributors(repo.full_name)]
+
+                owner, repo_name = repo.full_name.split('/')
+                contributors = await self.api_client.get_repository_contributors(owner, repo_name)
+                # Failed requests come back as an empty list; don't cache that until the next push
+                if self.state and contributors:
+                    self.state.set_contributors(repo.full_name, [asdict(c) for c in contributors])
+                    self.state.mark_current(repo.full_name, 'contributors', repo.pushed_at)
+                return contributors
+            except Exception as e:
+                logger.error(f"Error collecting contributors for {repo.full_name}: {e}")
+                return None
+
+        selected = repositories[:20]  # Limit for rate limiting
+        results = await asyncio.gather(*(collect(repo) for repo in selected))
+        contributor_patterns = {repo.full_name: c for repo, c in zip(selected, results) if c}
+
+        if self.state:
+            self.state.save()
+
+        cache_stats = self.api_client.user_cache.stats()
+        logger.info(f"Collected contributors for {len(contributor_patterns)} repositories; user profile cache: "
+                    f"{cache_stats['hits']} hits, {cache_stats['misses']} misses")
+
+        return contributor_patterns
+
+    async def collect_commit_activity(self, repositories: List[RepositoryData]) -> Dict[str, List[CommitData]]:
+        """Collect commits made since the last run for repositories"""
+        logger.info("Collecting commit activity")
+
+        async def collect(repo: RepositoryData) -> Optional[List[CommitData]]:
+            try:
+                since = None
+                if self.state:
+                    if self.state.is_current(repo.full_name, 'commits', repo.pushed_at):
+                        return None
+                    since = self.state.get_last_commit_date(repo.full_name)
+
+                owner, repo_name = repo.full_name.split('/')
+                # Only the first run is capped; see DataCollector.collect_commit_activity
+                max_items = None if since else 100
+                if self.commit_backend is self.api_client:
+                    commits = await self.api_client.get_repository_commits(owner, repo_name, since=since,
+                                                                           max_items=max_items)
+                else:
+                    # Local git backends block on subprocesses; keep them off the event loop
+                    commits = await asyncio.to_thread(self.commit_backend.get_repository_commits,
+                                                      owner, repo_name, since=since, max_items=max_items)
+
+                # `since` is inclusive; commits sharing its timestamp may be new, so compare SHAs
+                seen = set(self.state.get_last_commit_shas(repo.full_name)) if self.state else set()
+                commits = [c for c in commits if c.sha not in seen]
+                if commits and self.commit_backend is self.api_client:
+                    await self.api_client.fill_commit_stats(owner, repo_name, commits)
+                if self.state:
+                    if commits:
+                        last_date = max(c.date for c in commits)
+                        self.state.set_last_commit(repo.full_name, last_date,
+                                                   [c.sha for c in commits if c.date == last_date])
+                    self.state.mark_current(repo.full_name, 'commits', repo.pushed_at)
+                return commits
+            except Exception as e:
+                logger.error(f"Error collecting commits for {repo.full_name}: {e}")
+                return None
+
+        selected = repositories[:20]  # Limit for rate limiting
+        results = await asyncio.gather(*(collect(repo) for repo in selected))
+        commit_activity = {repo.full_name: c for repo, c in zip(selected, results) if c}
+
+        if self.state:
+            self.state.save()
+
+        return commit_activity
+
+    async def collect_recent_activity(self, organizations: List[str]) -> Dict[str, List[Dict]]:
+        """Collect new activity from key organizations"""
+        logger.info("Collecting recent organization activity")
+        ingester = self.event_ingester
+
+        async def collect(org: str) -> Optional[List[Dict]]:
+            try:
+                last_event_id = ingester.state.get_last_event_id(org)
+                events = []
+
+                # Events arrive newest first; stop paging at the last one already seen
+                async for event in self.api_client.iter_organization_events(org, max_items=ingester.max_events):
+                    if last_event_id is not None and int(event['id']) <= last_event_id:
+                        break
+                    events.append(event)
+
+                return ingester.ingest(org, events)
+            except Exception as e:
+                logger.error(f"Error collecting activity for {org}: {e}")
+                return None
+
+        # Only organizations due for a poll, as far as the polling budget allows
+        selected = ingester.select_due(organizations)
+        results = await asyncio.gather(*(collect(org) for org in selected))
+        activities = {org: events for org, events in zip(selected, results) if events}
+
+        ingester.state.save()
+        return activities
+
+    async def collect_all(self, min_stars: int, organizations: List[str]
+                          ) -> Tuple[List[RepositoryData], Dict[str, List[ContributorData]],
+                                     Dict[str, List[CommitData]], Dict[str, List[Dict]]]:
+        """Run a full collection cycle, overlapping the independent phases"""
+        repositories, activities = await asyncio.gather(
+            self.collect_top_repositories(min_stars=min_stars),
+            self.collect_recent_activity(organizations)
+        )
+        contributor_patterns, commit_activity = await asyncio.gather(
+            self.collect_contributor_patterns(repositories),
+            self.collect_commit_activity(repositories)
+        )
+        return repositories, contributor_patterns, commit_activity, activities
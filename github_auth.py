@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+GitHub M&A Intelligence Authentication
+Pool of GitHub credentials (personal access tokens and GitHub App installations)
+"""
+
+import os
+import time
+import logging
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional
+import jwt
+import requests
+from github_rate_limit import RateLimitGovernor
+
+logger = logging.getLogger(__name__)
+
+def _env_governor(limit: int) -> RateLimitGovernor:
+    return RateLimitGovernor(
+        limit=limit,
+        window_seconds=float(os.getenv('GITHUB_API_RATE_WINDOW_SECONDS', 3600)),
+        reserve=int(os.getenv('GITHUB_API_RATE_RESERVE', 500))
+    )
+
+class TokenCredential:
+    """Personal access token (or anonymous access) with its own rate limit governor"""
+
+    def __init__(self, token: Optional[str], name: Optional[str] = None,
+                 governor: Optional[RateLimitGovernor] = None):
+        self.token = token
+        self.name = name or (f'token-...{token[-4:]}' if token else 'anonymous')
+        # Unauthenticated requests are limited to 60 per hour
+        self.governor = governor or _env_governor(
+            int(os.getenv('GITHUB_API_RATE_LIMIT', 5000)) if token else 60
+        )
+
+    def authorization_header(self) -> Optional[str]:
+        return f'token {self.token}' if self.token else None
+
+class AppInstallationCredential:
+    """GitHub App installation that mints and refreshes its own installation tokens"""
+
+    # Refresh installation tokens this long before they expire
+    refresh_margin_seconds = 300
+
+    def __init__(self, app_id: str, private_key: str, installation_id: str,
+                 base_url: str = 'https://api.github.com', governor: Optional[RateLimitGovernor] = None):
+        self.app_id = app_id
+        self.private_key = private_key
+        self.installation_id = installation_id
+        self.base_url = base_url.rstrip('/')
+        self.name = f'app-{app_id}/installation-{installation_id}'
+        self.governor = governor or _env_governor(int(os.getenv('GITHUB_API_RATE_LIMIT', 5000)))
+
+        self._token = None
+        self._expires_at = 0.0
+        self._lock = threading.Lock()
+
+    def authorization_header(self) -> Optional[str]:
+        with self._lock:
+            if not self._token or time.time() > self._expires_at - self.refresh_margin_seconds:
+                self._refresh_token()
+            return f'token {self._token}'
+
+    def _app_jwt(self) -> str:
+        """Short-lived JWT identifying the GitHub App itself"""
+        now = int(time.time())
+        payload = {
+            'iat': now - 60,  # Allow for clock drift
+            'exp': now + 540,
+            'iss': str(self.app_id)
+        }
+        return jwt.encode(payload, self.private_key, algorithm='RS256')
+
+    def _refresh_token(self):
+        url = f'{self.base_url}/app/installations/{self.installation_id}/access_tokens'
+        response = requests.post(url, headers={
+            'Authorization': f'Bearer {self._app_jwt()}',
+            'Accept': 'application/vnd.github.v3+json'
+        }, timeout=30)
+        response.raise_for_status()
+
+        data = response.json()
+        self._token = data['token']
+        self._expires_at = datetime.fromisoformat(data['expires_at'].replace('Z', '+00:00')).timestamp()
+        logger.info(f"Minted installation token for {self.name}")
+
+class CredentialPool:
+    """Routes each request to the credential with the most remaining quota"""
+
+    def __init__(self, credentials: List):
+        if not credentials:
+            credentials = [TokenCredential(None)]
+        self.credentials = credentials
+
+    @classmethod
+    def from_env(cls, token: Optional[str] = None, base_url: str = 'https://api.github.com') -> 'CredentialPool':
+        """Build the pool from GITHUB_TOKEN(S) and GitHub App settings"""
+        tokens = [token] if token else []
+        tokens += [t.strip() for t in os.getenv('GITHUB_TOKENS', '').split(',') if t.strip()]
+        if not tokens and os.getenv('GITHUB_TOKEN'):
+            tokens.append(os.getenv('GITHUB_TOKEN'))
+
+        credentials = [TokenCredential(t) for t in dict.fromkeys(tokens)]
+
+        app_id = os.getenv('GITHUB_APP_ID')
+        key_path = os.getenv('GITHUB_APP_PRIVATE_KEY_PATH')
+        installation_ids = [i.strip() for i in os.getenv('GITHUB_APP_INSTALLATION_IDS', '').split(',') if i.strip()]
+        if app_id and key_path and installation_ids:
+            with open(key_path) as f:
+                private_key = f.read()
+            credentials += [
+                AppInstallationCredential(app_id, private_key, installation_id, base_url)
+                for installation_id in installation_ids
+            ]
+
+        return cls(credentials)
+
+    def select(self):
+        """The credential with the most usable quota"""
+        now = time.time()
+        return max(
+            self.credentials,
+            key=lambda c: c.governor.remaining if c.governor.blocked_until <= now else -c.governor.blocked_until
+        )
+
+    def acquire(self):
+        """Pick the credential with the most usable quota and wait for its governor"""
+        credential = self.select()
+        credential.governor.acquire()
+        return credential
+
+    @property
+    def remaining(self) -> int:
+        return sum(max(c.governor.remaining, 0) for c in self.credentials)
+
+    @property
+    def reset_at(self) -> float:
+        return min(c.governor.reset_at for c in self.credentials)
+
+    def quota(self) -> List[Dict]:
+        """Per-credential quota and throttling"""
+        return [{'credential': c.name, **c.governor.stats()} for c in self.credentials]
@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""
+GitHub M&A Intelligence Caches
+Caches that save GitHub API calls across repositories and collection runs
+"""
+
+import os
+import json
+import time
+import sqlite3
+import logging
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+class UserProfileCache:
+    """LRU cache of GitHub user profiles with a TTL and an optional SQLite backing store"""
+
+    def __init__(self, ttl_seconds: float = 86400, max_size: int = 10000, db_path: Optional[str] = None):
+        self.ttl_seconds = ttl_seconds
+        self.max_size = max_size
+        self.db_path = db_path
+        self.hits = 0
+        self.misses = 0
+
+        self._entries = OrderedDict()  # login -> (fetched_at, profile)
+        self._lock = threading.Lock()
+        self._db = None
+
+        if db_path:
+            os.makedirs(os.path.dirname(db_path) or '.', exist_ok=True)
+            self._db = sqlite3.connect(db_path, check_same_thread=False)
+            self._db.execute(
+                'CREATE TABLE IF NOT EXISTS user_profiles ('
+                'login TEXT PRIMARY KEY, fetched_at REAL NOT NULL, profile TEXT NOT NULL)'
+            )
+            self._db.commit()
+            logger.info(f"User profile cache backed by {db_path}")
+
+    def get(self, login: str) -> Optional[Dict]:
+        """Return a cached profile, or None if it is missing or expired"""
+        key = login.lower()
+        now = time.time()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None and self._db is not None:
+                row = self._db.execute(
+                    'SELECT fetched_at, profile FROM user_profiles WHERE login = ?', (key,)
+                ).fetchone()
+                if row:
+                    entry = (row[0], json.loads(row[1]))
+                    self._store(key, entry)
+
+            if entry is None or now - entry[0] > self.ttl_seconds:
+                if entry is not None:
+                    self._evict(key)
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, login: str, profile: Dict):
+        """Cache a freshly fetched profile"""
+        key = login.lower()
+        entry = (time.time(), profile)
+
+        with self._lock:
+            self._store(key, entry)
+            if self._db is not None:
+                self._db.execute(
+                    'INSERT OR REPLACE INTO user_profiles (login, fetched_at, profile) VALUES (?, ?, ?)',
+                    (key, entry[0], json.dumps(profile))
+                )
+                self._db.commit()
+
+    def stats(self) -> Dict[str, float]:
+        """Hit/miss counters; every hit is one API call saved"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'size': len(self._entries)
+            }
+
+    def reset_stats(self):
+        """Reset hit/miss counters, e.g. at the start of a collection run"""
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+
+    def close(self):
+        """Close the backing store"""
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    def _store(self, key: str, entry):
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def _evict(self, key: str):
+        self._entries.pop(key, None)
+        if self._db is not None:
+            self._db.execute('DELETE FROM user_profiles WHERE login = ?', (key,))
+            self._db.commit()
+
+class ValidatorCache:
+    """LRU cache of HTTP validators (ETag/Last-Modified) and bodies for conditional requests"""
+
+    def __init__(self, max_entries: int = 2000):
+        self.max_entries = max_entries
+        self.requests = 0
+        self.conditional_requests = 0
+        self.not_modified = 0
+
+        self._entries = OrderedDict()  # (url, params) -> {'etag', 'last_modified', 'body', 'next_url'}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(url: str, params: Optional[Dict] = None) -> Tuple:
+        return url, tuple(sorted((params or {}).items()))
+
+    def get(self, key: Tuple) -> Optional[Dict]:
+        """Cached validators and body for a request, if any"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    @staticmethod
+    def conditional_headers(entry: Optional[Dict]) -> Dict[str, str]:
+        """Headers that let GitHub answer 304 Not Modified for a repeated request"""
+        headers = {}
+        if entry:
+            if entry['etag']:
+                headers['If-None-Match'] = entry['etag']
+            if entry['last_modified']:
+                headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def set(self, key: Tuple, etag: Optional[str], last_modified: Optional[str], body,
+            next_url: Optional[str] = None):
+        """Store validators, body and next-page link from a 200 response"""
+        if not etag and not last_modified:
+            return
+
+        with self._lock:
+            self._entries[key] = {
+                'etag': etag,
+                'last_modified': last_modified,
+                'body': body,
+                'next_url': next_url
+            }
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def record(self, conditional: bool, not_modified: bool):
+        """Count a completed request"""
+        with self._lock:
+            self.requests += 1
+            self.conditional_requests += conditional
+            self.not_modified += not_modified
+
+    def stats(self) -> Dict[str, float]:
+        """304 metrics; 304 responses don't count against the rate limit"""
+        with self._lock:
+            return {
+                'requests': self.requests,
+                'conditional_requests': self.conditional_requests,
+                'not_modified': self.not_modified,
+                'not_modified_ratio': self.not_modified / self.requests if self.requests else 0.0,
+                'entries': len(self._entries)
+            }
+
+class CommitStatsCache:
+    """Diff stats by commit SHA; commits are immutable, so entries never expire"""
+
+    def __init__(self, max_size: int = 100000, db_path: Optional[str] = None):
+        self.max_size = max_size
+        self.db_path = db_path
+        self.hits = 0
+        self.misses = 0
+
+        self._entries = OrderedDict()  # sha -> (additions, deletions, files_changed)
+        self._lock = threading.Lock()
+        self._db = None
+
+        if db_path:
+            os.makedirs(os.path.dirname(db_path) or '.', exist_ok=True)
+            self._db = sqlite3.connect(db_path, check_same_thread=False)
+            self._db.execute(
+                'CREATE TABLE IF NOT EXISTS commit_stats ('
+                'sha TEXT PRIMARY KEY, additions INTEGER NOT NULL, '
+                'deletions INTEGER NOT NULL, files_changed INTEGER NOT NULL)'
+            )
+            self._db.commit()
+            logger.info(f"Commit stats cache backed by {db_path}")
+
+    def get_many(self, shas: List[str]) -> Dict[str, Tuple[int, int, int]]:
+        """Cached stats for whichever of `shas` are known"""
+        found = {}
+
+        with self._lock:
+            missing = []
+            for sha in shas:
+                entry = self._entries.get(sha)
+                if entry is None:
+                    missing.append(sha)
+                else:
+                    self._entries.move_to_end(sha)
+                    found[sha] = entry
+
+            # SQLite limits bound parameters, so look up in chunks
+            if missing and self._db is not None:
+                for i in range(0, len(missing), 500):
+                    chunk = missing[i:i + 500]
+                    rows = self._db.execute(
+                        f"SELECT sha, additions, deletions, files_changed FROM commit_stats "
+                        f"WHERE sha IN ({','.join('?' * len(chunk))})", chunk
+                    ).fetchall()
+                    for sha, *entry in rows:
+                        found[sha] = tuple(entry)
+                        self._store(sha, tuple(entry))
+
+            self.hits += len(found)
+            self.misses += len(shas) - len(found)
+            return found
+
+    def set_many(self, stats: Dict[str, Tuple[int, int, int]]):
+        """Cache freshly fetched stats"""
+        if not stats:
+            return
+
+        with self._lock:
+            for sha, entry in stats.items():
+                self._store(sha, tuple(entry))
+            if self._db is not None:
+                self._db.executemany(
+                    'INSERT OR REPLACE INTO commit_stats (sha, additions, deletions, files_changed) '
+                    'VALUES (?, ?, ?, ?)',
+                    [(sha, *entry) for sha, entry in stats.items()]
+                )
+                self._db.commit()
+
+    def stats(self) -> Dict[str, float]:
+        """Hit/miss counters; every hit is one commit whose stats needn't be fetched"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'size': len(self._entries)
+            }
+
+    def close(self):
+        """Close the backing store"""
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    def _store(self, sha: str, entry: Tuple[int, int, int]):
+        self._entries[sha] = entry
+        self._entries.move_to_end(sha)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
@@ -7,16 +7,22 @@ Real-time collection of repository data, contributor patterns, and ownership cha
 import os
 import requests
 import time
-import json
 import logging
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterator, List, Optional, Tuple
+from urllib.parse import urlparse
 from dataclasses import dataclass, asdict
 from collections import defaultdict
 import pandas as pd
-from ratelimit import limits, sleep_and_retry
-import jwt
+from requests.adapters import HTTPAdapter
 from dotenv import load_dotenv
+from github_auth import CredentialPool
+from github_state import CollectionState
+from github_events import EventIngester, load_watchlist
+from github_cache import UserProfileCache, ValidatorCache, CommitStatsCache
+from github_resilience import RetryPolicy, HostCircuitBreakers, CircuitOpenError
 
 # Load environment variables
 load_dotenv()
@@ -63,6 +69,7 @@ class ContributorData:
     followers: int
     following: int
     created_at: str
+    id: Optional[int] = None  # GitHub user id
 
 @dataclass
 class CommitData:
@@ -87,59 +94,259 @@ class TransferEvent:
     transfer_type: str
     confidence_score: float
 
+# Repository payload fields RepositoryData is built from; search results carry them too
+REPOSITORY_PAYLOAD_FIELDS = (
+    'id', 'name', 'full_name', 'owner', 'stargazers_count', 'forks_count', 'watchers_count',
+    'size', 'created_at', 'updated_at', 'pushed_at', 'archived', 'disabled'
+)
+
+def repository_from_payload(data: Dict) -> RepositoryData:
+    """Map a REST repository payload (details or search item) onto RepositoryData"""
+    return RepositoryData(
+        id=data['id'],
+        name=data['name'],
+        full_name=data['full_name'],
+        owner=data['owner']['login'],
+        owner_type=data['owner']['type'],
+        description=data.get('description', ''),
+        language=data.get('language', 'Unknown'),
+        stars=data['stargazers_count'],
+        forks=data['forks_count'],
+        watchers=data['watchers_count'],
+        size=data['size'],
+        created_at=data['created_at'],
+        updated_at=data['updated_at'],
+        pushed_at=data['pushed_at'],
+        topics=data.get('topics', []),
+        license=data.get('license', {}).get('name') if data.get('license') else None,
+        archived=data['archived'],
+        disabled=data['disabled'],
+        visibility=data.get('visibility', 'public')
+    )
+
+def contributor_from_payload(contributor: Dict, user_data: Dict) -> ContributorData:
+    """Map a contributors list entry and its user profile onto ContributorData"""
+    return ContributorData(
+        username=contributor['login'],
+        contributions=contributor['contributions'],
+        company=user_data.get('company'),
+        location=user_data.get('location'),
+        hireable=user_data.get('hireable', False),
+        public_repos=user_data.get('public_repos', 0),
+        followers=user_data.get('followers', 0),
+        following=user_data.get('following', 0),
+        created_at=user_data.get('created_at', ''),
+        id=contributor.get('id') or user_data.get('id')
+    )
+
+def commit_from_payload(commit: Dict) -> CommitData:
+    """Map a REST commit payload onto CommitData"""
+    commit_info = commit['commit']
+    author_info = commit.get('author', {})
+
+    return CommitData(
+        sha=commit['sha'],
+        author=author_info.get('login', ''),
+        committer=commit_info['committer']['name'],
+        message=commit_info['message'],
+        date=commit_info['committer']['date'],
+        additions=0,  # Filled in by GitHubAPIClient.fill_commit_stats
+        deletions=0,
+        files_changed=0
+    )
+
 class GitHubAPIClient:
     """GitHub API client with rate limiting and authentication"""
 
-    def __init__(self, token: Optional[str] = None):
+    def __init__(self, token: Optional[str] = None, base_url: Optional[str] = None,
+                 max_workers: Optional[int] = None, user_cache: Optional[UserProfileCache] = None,
+                 credentials: Optional[CredentialPool] = None):
         self.token = token or os.getenv('GITHUB_TOKEN')
-        self.base_url = 'https://api.github.com'
+        self.base_url = (base_url or os.getenv('GITHUB_API_BASE_URL', 'https://api.github.com')).rstrip('/')
         self.session = requests.Session()
 
-        if self.token:
-            self.session.headers.update({
-                'Authorization': f'token {self.token}',
-                'Accept': 'application/vnd.github.v3+json'
-            })
+        # Personal access tokens and GitHub App installations, each with its
+        # own rate limit; every request goes to the one with the most quota left
+        self.credentials = credentials or CredentialPool.from_env(token, self.base_url)
 
-        # Rate limiting: 5000 requests per hour for authenticated users
-        self.rate_limit_remaining = 5000
-        self.rate_limit_reset = None
+        # Worker threads used to enrich contributors with user profiles.
+        # All workers share the session and the rate limit below.
+        self.max_workers = max(1, max_workers or int(os.getenv('GITHUB_ENRICHMENT_WORKERS', 8)))
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=self.max_workers)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+        self.session.headers.update({'Accept': 'application/vnd.github.v3+json'})
+
+        # User profiles are shared by many repositories, so cache them across calls
+        self.user_cache = user_cache or UserProfileCache(
+            ttl_seconds=float(os.getenv('USER_CACHE_TTL_SECONDS', 86400)),
+            max_size=int(os.getenv('USER_CACHE_MAX_SIZE', 10000)),
+            db_path=os.getenv('USER_CACHE_PATH') or None
+        )
+
+        # ETags and bodies of earlier responses; 304 replies are free of rate limit
+        self.validator_cache = ValidatorCache(max_entries=int(os.getenv('HTTP_CACHE_MAX_ENTRIES', 2000)))
+
+        # Commit diff stats never change, so each SHA is fetched once and kept
+        self.commit_stats_cache = CommitStatsCache(
+            max_size=int(os.getenv('COMMIT_STATS_CACHE_MAX_SIZE', 100000)),
+            db_path=os.getenv('COMMIT_STATS_CACHE_PATH') or None
+        )
+        self.commit_stats_mode = os.getenv('GITHUB_COMMIT_STATS_MODE', 'graphql').lower()
+        self.commit_stats_batch_size = 100
+
+        self.poll_intervals = {}  # url -> seconds GitHub asks us to wait between polls
+
+        # Bounded waits, retries of transient failures, and fail-fast when GitHub is degraded
+        self.timeout = (float(os.getenv('GITHUB_CONNECT_TIMEOUT', 5)), float(os.getenv('GITHUB_READ_TIMEOUT', 30)))
+        self.retry_policy = RetryPolicy.from_env()
+        self.circuit_breakers = HostCircuitBreakers.from_env()
+
+    @property
+    def rate_limit_remaining(self) -> int:
+        return self.credentials.remaining
+
+    @property
+    def rate_limit_reset(self) -> float:
+        return self.credentials.reset_at
+
+    def _send(self, method: str, url: str, headers: Optional[Dict] = None,
+              rate_limited: bool = True, **kwargs) -> requests.Response:
+        """Send an authorized request with timeouts, jittered retries and the host's circuit breaker"""
+        breaker = self.circuit_breakers.for_url(url)
+        attempt = 0
+
+        while True:
+            if not breaker.allow():
+                raise CircuitOpenError(f"Circuit open for {urlparse(url).netloc}, not sending {method} {url}")
+
+            # Rate limiting is paced per credential from the headers of every response
+            credential = self.credentials.acquire()
+            request_headers = dict(headers or {})
+            authorization = credential.authorization_header()
+            if authorization:
+                request_headers['Authorization'] = authorization
+
+            try:
+                response = self.session.request(method, url, headers=request_headers,
+                                                timeout=self.timeout, **kwargs)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                self.circuit_breakers.record(url, None)
+                delay = self.retry_policy.retry_delay(attempt)
+                if delay is None:
+                    raise
+                logger.warning(f"{method} {url} failed ({e}), retrying in {delay:.1f}s")
+            else:
+                if rate_limited:
+                    credential.governor.update(response.headers, response.status_code)
+                elif 'Retry-After' in response.headers:
+                    credential.governor.update({'Retry-After': response.headers['Retry-After']})
+                self.circuit_breakers.record(url, response.status_code)
+
+                delay = self.retry_policy.retry_delay(attempt, response.status_code, response.headers)
+                if delay is None:
+                    return response
+                logger.warning(f"{method} {url} returned {response.status_code}, retrying in {delay:.1f}s")
+
+            time.sleep(delay)
+            attempt += 1
+
+    def _fetch(self, url: str, params: Optional[Dict] = None) -> Tuple[Optional[Dict], Optional[str]]:
+        """Make rate-limited conditional request; returns the body and the Link rel="next" URL"""
+        cache_key = self.validator_cache.key(url, params)
+        cached = self.validator_cache.get(cache_key)
+        headers = self.validator_cache.conditional_headers(cached)
 
-    @sleep_and_retry
-    @limits(calls=5000, period=3600)
-    def _make_request(self, url: str, params: Optional[Dict] = None) -> Optional[Dict]:
-        """Make rate-limited request to GitHub API"""
         try:
-            response = self.session.get(url, params=params)
+            response = self._send('GET', url, headers, params=params)
             response.raise_for_status()
 
-            # Update rate limit info
-            if 'X-RateLimit-Remaining' in response.headers:
-                self.rate_limit_remaining = int(response.headers['X-RateLimit-Remaining'])
-            if 'X-RateLimit-Reset' in response.headers:
-                self.rate_limit_reset = int(response.headers['X-RateLimit-Reset'])
-
-            return response.json()
-        except requests.exceptions.RequestException as e:
+            # Event feeds say how often they may be polled
+            if 'X-Poll-Interval' in response.headers:
+                self.poll_intervals[url] = float(response.headers['X-Poll-Interval'])
+
+            if response.status_code == 304 and cached:
+                self.validator_cache.record(conditional=True, not_modified=True)
+                return cached['body'], cached['next_url']
+
+            data = response.json()
+            next_url = response.links.get('next', {}).get('url')
+            self.validator_cache.set(cache_key, response.headers.get('ETag'),
+                                     response.headers.get('Last-Modified'), data, next_url)
+            self.validator_cache.record(conditional=cached is not None, not_modified=False)
+            return data, next_url
+        except (requests.exceptions.RequestException, CircuitOpenError) as e:
             logger.error(f"API request failed: {e}")
+            return None, None
+
+    def graphql(self, query: str, variables: Optional[Dict] = None) -> Optional[Dict]:
+        """Run a GraphQL query and return its data"""
+        try:
+            # GraphQL has its own point-based quota; only honor secondary limits here
+            response = self._send('POST', f'{self.base_url}/graphql', rate_limited=False,
+                                  json={'query': query, 'variables': variables or {}})
+            response.raise_for_status()
+
+            payload = response.json()
+            if payload.get('errors'):
+                logger.error(f"GraphQL query returned errors: {payload['errors']}")
+            return payload.get('data')
+        except (requests.exceptions.RequestException, CircuitOpenError) as e:
+            logger.error(f"GraphQL request failed: {e}")
             return None
 
-    def get_top_repositories(self, language: Optional[str] = None, min_stars: int = 1000) -> List[Dict]:
-        """Get top repositories by stars"""
-        params = {
-            'q': f'stars:>{min_stars} sort:stars-desc',
-            'per_page': 100
+    def _make_request(self, url: str, params: Optional[Dict] = None) -> Optional[Dict]:
+        """Make rate-limited conditional request to GitHub API"""
+        return self._fetch(url, params)[0]
+
+    def _paginate(self, url: str, params: Optional[Dict] = None, max_items: Optional[int] = None,
+                  items_key: Optional[str] = None) -> Iterator[Dict]:
+        """Yield items page by page, following Link rel="next" only while more are wanted"""
+        params = dict(params or {})
+        params['per_page'] = min(100, max_items) if max_items else 100
+        yielded = 0
+
+        while url and (max_items is None or yielded < max_items):
+            data, next_url = self._fetch(url, params)
+            if not data:
+                return
+
+            items = data.get(items_key, []) if items_key else data
+            for item in items:
+                yield item
+                yielded += 1
+                if max_items is not None and yielded >= max_items:
+                    return
+
+            # The next URL already carries the query string
+            url, params = next_url, None
+
+    def get_request_stats(self) -> Dict[str, float]:
+        """Request metrics, including the share of free 304 Not Modified responses"""
+        return {
+            **self.validator_cache.stats(),
+            **self.retry_policy.stats(),
+            'rate_limit_remaining': self.rate_limit_remaining,
+            'credentials': self.credentials.quota(),
+            'circuit_breakers': self.circuit_breakers.stats(),
+            'commit_stats_cache': self.commit_stats_cache.stats()
         }
 
+    def iter_top_repositories(self, language: Optional[str] = None, min_stars: int = 1000,
+                              max_items: Optional[int] = None) -> Iterator[Dict]:
+        """Stream top repositories by stars"""
+        query = f'stars:>{min_stars} sort:stars-desc'
         if language:
-            params['q'] += f' language:{language}'
+            query += f' language:{language}'
 
         url = f'{self.base_url}/search/repositories'
-        response = self._make_request(url, params)
+        return self._paginate(url, {'q': query}, max_items, items_key='items')
 
-        if response and 'items' in response:
-            return response['items']
-        return []
+    def get_top_repositories(self, language: Optional[str] = None, min_stars: int = 1000,
+                             max_items: int = 100) -> List[Dict]:
+        """Get top repositories by stars"""
+        return list(self.iter_top_repositories(language, min_stars, max_items))
 
     def get_repository_details(self, owner: str, repo: str) -> Optional[RepositoryData]:
         """Get detailed repository information"""
@@ -149,174 +356,352 @@ class GitHubAPIClient:
         if not data:
             return None
 
-        return RepositoryData(
-            id=data['id'],
-            name=data['name'],
-            full_name=data['full_name'],
-            owner=data['owner']['login'],
-            owner_type=data['owner']['type'],
-            description=data.get('description', ''),
-            language=data.get('language', 'Unknown'),
-            stars=data['stargazers_count'],
-            forks=data['forks_count'],
-            watchers=data['watchers_count'],
-            size=data['size'],
-            created_at=data['created_at'],
-            updated_at=data['updated_at'],
-            pushed_at=data['pushed_at'],
-            topics=data.get('topics', []),
-            license=data.get('license', {}).get('name') if data.get('license') else None,
-            archived=data['archived'],
-            disabled=data['disabled'],
-            visibility=data.get('visibility', 'public')
-        )
+        return repository_from_payload(data)
 
-    def get_repository_contributors(self, owner: str, repo: str, max_contributors: int = 100) -> List[ContributorData]:
-        """Get repository contributors"""
+    def iter_repository_contributors(self, owner: str, repo: str,
+                                     max_items: Optional[int] = None) -> Iterator[ContributorData]:
+        """Stream repository contributors, enriching each page of them concurrently"""
         url = f'{self.base_url}/repos/{owner}/{repo}/contributors'
-        params = {'per_page': 100, 'anon': 'false'}
-        response = self._make_request(url, params)
-
-        contributors = []
-        if response:
-            for contributor in response[:max_contributors]:
-                # Get detailed user info
-                user_data = self.get_user_details(contributor['login'])
+        pages = self._paginate(url, {'anon': 'false'}, max_items)
+
+        while True:
+            # Enrich a page worth of contributors at a time
+            raw_contributors = list(islice(pages, 100))
+            if not raw_contributors:
+                return
+
+            # Get detailed user info, preserving the contributor order
+            user_details = self.get_users_details([c['login'] for c in raw_contributors])
+
+            for contributor, user_data in zip(raw_contributors, user_details):
                 if user_data:
-                    contributors.append(ContributorData(
-                        username=contributor['login'],
-                        contributions=contributor['contributions'],
-                        company=user_data.get('company'),
-                        location=user_data.get('location'),
-                        hireable=user_data.get('hireable', False),
-                        public_repos=user_data.get('public_repos', 0),
-                        followers=user_data.get('followers', 0),
-                        following=user_data.get('following', 0),
-                        created_at=user_data.get('created_at', '')
-                    ))
-
-        return contributors
+                    yield contributor_from_payload(contributor, user_data)
+
+    def get_repository_contributors(self, owner: str, repo: str, max_contributors: int = 100) -> List[ContributorData]:
+        """Get repository contributors"""
+        return list(self.iter_repository_contributors(owner, repo, max_contributors))
 
     def get_user_details(self, username: str) -> Optional[Dict]:
         """Get detailed user information"""
+        cached = self.user_cache.get(username)
+        if cached is not None:
+            return cached
+
         url = f'{self.base_url}/users/{username}'
-        return self._make_request(url)
+        user_data = self._make_request(url)
+        if user_data:
+            self.user_cache.set(username, user_data)
+        return user_data
+
+    def get_users_details(self, usernames: List[str]) -> List[Optional[Dict]]:
+        """Get user information for several users concurrently, in input order"""
+        if self.max_workers == 1 or len(usernames) <= 1:
+            return [self.get_user_details(username) for username in usernames]
+
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(usernames))) as executor:
+            return list(executor.map(self.get_user_details, usernames))
+
+    def iter_repository_commits(self, owner: str, repo: str, since: Optional[str] = None,
+                                max_items: Optional[int] = None) -> Iterator[CommitData]:
+        """Stream repository commits, newest first"""
+        url = f'{self.base_url}/repos/{owner}/{repo}/commits'
+        params = {'since': since} if since else {}
+
+        for commit in self._paginate(url, params, max_items):
+            if commit.get('author') and commit.get('commit'):
+                yield commit_from_payload(commit)
 
-    def get_repository_commits(self, owner: str, repo: str, since: Optional[str] = None) -> List[CommitData]:
+    def get_repository_commits(self, owner: str, repo: str, since: Optional[str] = None,
+                               max_items: Optional[int] = 100) -> List[CommitData]:
         """Get repository commits"""
-        url = f'{self.base_url}/repos/{owner}/{repo}/commits'
-        params = {'per_page': 100}
-        if since:
-            params['since'] = since
-
-        response = self._make_request(url, params)
-        commits = []
-
-        if response:
-            for commit in response:
-                if commit.get('author') and commit.get('commit'):
-                    commit_info = commit['commit']
-                    author_info = commit.get('author', {})
-
-                    commits.append(CommitData(
-                        sha=commit['sha'],
-                        author=author_info.get('login', ''),
-                        committer=commit_info['committer']['name'],
-                        message=commit_info['message'],
-                        date=commit_info['committer']['date'],
-                        additions=0,  # Would need separate API call for stats
-                        deletions=0,
-                        files_changed=0
-                    ))
+        return list(self.iter_repository_commits(owner, repo, since, max_items))
 
+    def get_commit_stats(self, owner: str, repo: str, shas: List[str]) -> Dict[str, Tuple[int, int, int]]:
+        """(additions, deletions, files_changed) per commit SHA, fetching each SHA at most once"""
+        stats = self.commit_stats_cache.get_many(list(dict.fromkeys(shas)))
+        missing = [sha for sha in dict.fromkeys(shas) if sha not in stats]
+
+        for i in range(0, len(missing), self.commit_stats_batch_size):
+            batch = missing[i:i + self.commit_stats_batch_size]
+            fetched = self._graphql_commit_stats(owner, repo, batch) if self.commit_stats_mode == 'graphql' else {}
+
+            # Commits GraphQL couldn't diff (or every commit, in REST mode) take one call each
+            remaining = [sha for sha in batch if sha not in fetched]
+            if remaining:
+                with ThreadPoolExecutor(max_workers=min(self.max_workers, len(remaining))) as executor:
+                    for sha, commit_stats in zip(remaining, executor.map(
+                            lambda sha: self._rest_commit_stats(owner, repo, sha), remaining)):
+                        if commit_stats:
+                            fetched[sha] = commit_stats
+
+            self.commit_stats_cache.set_many(fetched)
+            stats.update(fetched)
+
+        return stats
+
+    def _graphql_commit_stats(self, owner: str, repo: str, shas: List[str]) -> Dict[str, Tuple[int, int, int]]:
+        from github_graphql import commit_stats_query, commit_stats_from_data
+
+        variables = {'owner': owner, 'name': repo, **{f'sha{i}': sha for i, sha in enumerate(shas)}}
+        data = self.graphql(commit_stats_query(len(shas)), variables)
+        return commit_stats_from_data(data) if data else {}
+
+    def _rest_commit_stats(self, owner: str, repo: str, sha: str) -> Optional[Tuple[int, int, int]]:
+        # Commit bodies include patches and never change, so skip the validator cache
+        try:
+            response = self._send('GET', f'{self.base_url}/repos/{owner}/{repo}/commits/{sha}')
+            response.raise_for_status()
+            data = response.json()
+            return data['stats']['additions'], data['stats']['deletions'], len(data.get('files', []))
+        except (requests.exceptions.RequestException, CircuitOpenError, KeyError) as e:
+            logger.error(f"Failed to fetch stats for {owner}/{repo}@{sha[:7]}: {e}")
+            return None
+
+    def fill_commit_stats(self, owner: str, repo: str, commits: List[CommitData]) -> List[CommitData]:
+        """Fill additions, deletions and files_changed of commits in place"""
+        stats = self.get_commit_stats(owner, repo, [commit.sha for commit in commits])
+        for commit in commits:
+            if commit.sha in stats:
+                commit.additions, commit.deletions, commit.files_changed = stats[commit.sha]
         return commits
 
-    def get_organization_events(self, org: str, event_type: Optional[str] = None) -> List[Dict]:
-        """Get organization events"""
+    def iter_organization_events(self, org: str, event_type: Optional[str] = None,
+                                 max_items: Optional[int] = None) -> Iterator[Dict]:
+        """Stream organization events, newest first"""
         url = f'{self.base_url}/orgs/{org}/events'
-        params = {'per_page': 100}
-        response = self._make_request(url, params)
-
-        if not response:
-            return []
+        if not event_type:
+            return self._paginate(url, max_items=max_items)
 
-        if event_type:
-            return [event for event in response if event['type'] == event_type]
+        events = (event for event in self._paginate(url) if event['type'] == event_type)
+        return islice(events, max_items)
 
-        return response
+    def get_organization_events(self, org: str, event_type: Optional[str] = None,
+                                max_items: int = 100) -> List[Dict]:
+        """Get organization events"""
+        return list(self.iter_organization_events(org, event_type, max_items))
 
-    def search_repositories(self, query: str, sort: str = 'stars', order: str = 'desc') -> List[Dict]:
-        """Search repositories with custom query"""
+    def iter_search_repositories(self, query: str, sort: str = 'stars', order: str = 'desc',
+                                 max_items: Optional[int] = None) -> Iterator[Dict]:
+        """Stream repositories matching a custom query"""
         url = f'{self.base_url}/search/repositories'
         params = {
             'q': query,
             'sort': sort,
-            'order': order,
-            'per_page': 100
+            'order': order
         }
+        return self._paginate(url, params, max_items, items_key='items')
 
-        response = self._make_request(url, params)
-        if response and 'items' in response:
-            return response['items']
-        return []
+    def search_repositories(self, query: str, sort: str = 'stars', order: str = 'desc',
+                            max_items: int = 100) -> List[Dict]:
+        """Search repositories with custom query"""
+        return list(self.iter_search_repositories(query, sort, order, max_items))
 
 class DataCollector:
     """Main data collection orchestrator"""
 
-    def __init__(self, api_client: GitHubAPIClient):
+    def __init__(self, api_client: GitHubAPIClient, state: Optional[CollectionState] = None,
+                 commit_backend=None):
         self.api_client = api_client
+        self.state = state  # High-water marks for incremental collection, if any
+
+        # Commits come from the API unless local git clones are configured
+        if commit_backend is None and os.getenv('GITHUB_COMMIT_BACKEND', 'api').lower() == 'git':
+            from github_git_backend import GitCommitBackend
+            commit_backend = GitCommitBackend.from_env()
+        self.commit_backend = commit_backend or api_client
+
+        # Without collection state, event and details marks last only as long as the collector
+        self.marks = state if state is not None else CollectionState(None)
+        self.event_ingester = EventIngester(api_client, state=self.marks)
         self.data_cache = {}
         self.collection_timestamp = None
 
-    def collect_top_repositories(self, min_stars: int = 5000) -> List[RepositoryData]:
-        """Collect data from top repositories"""
+        # Seconds after which search results are completed with a fresh details call
+        max_age = os.getenv('REPO_DETAILS_MAX_AGE')
+        self.details_max_age = float(max_age) if max_age else None
+
+    def collect_top_repositories(self, min_stars: int = 5000, max_repositories: int = 50,
+                                 details_max_age: Optional[float] = None) -> List[RepositoryData]:
+        """Collect data from top repositories, hydrated from search results where possible"""
         logger.info(f"Collecting top repositories with {min_stars}+ stars")
 
-        raw_repos = self.api_client.get_top_repositories(min_stars=min_stars)
+        raw_repos = self.api_client.iter_top_repositories(min_stars=min_stars, max_items=max_repositories)
         repositories = []
+        details_fetched = 0
 
-        for raw_repo in raw_repos[:50]:  # Limit to top 50 for rate limiting
+        for raw_repo in raw_repos:
             try:
-                owner, repo_name = raw_repo['full_name'].split('/')
-                repo_data = self.api_client.get_repository_details(owner, repo_name)
+                if self._needs_details(raw_repo, details_max_age):
+                    owner, repo_name = raw_repo['full_name'].split('/')
+                    repo_data = self.api_client.get_repository_details(owner, repo_name)
+                    if repo_data:
+                        self.marks.set_details_fetched_at(raw_repo['full_name'], time.time())
+                    details_fetched += 1
+                else:
+                    repo_data = repository_from_payload(raw_repo)
 
                 if repo_data:
                     repositories.append(repo_data)
                     logger.info(f"Collected data for {repo_data.full_name}")
 
-                # Respect rate limits
-                time.sleep(0.1)
-
             except Exception as e:
                 logger.error(f"Error collecting data for {raw_repo['full_name']}: {e}")
                 continue
 
+        logger.info(f"Hydrated {len(repositories) - details_fetched} repositories from search results, "
+                    f"fetched details for {details_fetched}")
+        if details_fetched:
+            self.marks.save()
+
         self.collection_timestamp = datetime.now()
         return repositories
 
+    def _needs_details(self, raw_repo: Dict, details_max_age: Optional[float]) -> bool:
+        """Whether a search item must be completed with a repository details call"""
+        # Refetch when search lacks a field, or when a max age is set (here or by
+        # REPO_DETAILS_MAX_AGE) and the details weren't fetched within that many seconds
+        if any(field not in raw_repo for field in REPOSITORY_PAYLOAD_FIELDS):
+            return True
+
+        details_max_age = details_max_age if details_max_age is not None else self.details_max_age
+        if details_max_age is None:
+            return False
+
+        fetched_at = self.marks.get_details_fetched_at(raw_repo['full_name'])
+        return fetched_at is None or time.time() - fetched_at > details_max_age
+
+    def collect_repositories_graphql(self, min_stars: int = 5000, max_repositories: int = 50,
+                                     max_contributors: int = 100, batch_size: int = 50
+                                     ) -> Tuple[List[RepositoryData], Dict[str, List[ContributorData]]]:
+        """Collect top repositories and their contributors with batched GraphQL queries"""
+        from github_graphql import REPOSITORY_SEARCH_QUERY, repository_from_node, contributors_from_node
+
+        logger.info(f"Collecting top repositories with {min_stars}+ stars via GraphQL")
+
+        repositories = []
+        contributor_patterns = {}
+        variables = {
+            'query': f'stars:>{min_stars} sort:stars-desc',
+            'historyLength': max_contributors,
+            'after': None
+        }
+
+        while len(repositories) < max_repositories:
+            variables['first'] = min(batch_size, max_repositories - len(repositories))
+            data = self.api_client.graphql(REPOSITORY_SEARCH_QUERY, variables)
+            if not data:
+                break
+
+            search = data['search']
+            for node in search['nodes']:
+                if not node:
+                    continue
+                try:
+                    repo_data = repository_from_node(node)
+                    repositories.append(repo_data)
+
+                    contributors = contributors_from_node(node, max_contributors)
+                    if contributors:
+                        contributor_patterns[repo_data.full_name] = contributors
+                except (KeyError, TypeError) as e:
+                    logger.error(f"Error mapping GraphQL repository {node.get('nameWithOwner')}: {e}")
+
+            if not search['pageInfo']['hasNextPage']:
+                break
+            variables['after'] = search['pageInfo']['endCursor']
+
+        logger.info(f"Collected {len(repositories)} repositories and contributors for "
+                    f"{len(contributor_patterns)} of them via GraphQL")
+
+        self.collection_timestamp = datetime.now()
+        return repositories, contributor_patterns
+
     def collect_contributor_patterns(self, repositories: List[RepositoryData]) -> Dict[str, List[ContributorData]]:
         """Collect contributor patterns for repositories"""
         logger.info("Collecting contributor patterns")
 
         contributor_patterns = {}
+        self.api_client.user_cache.reset_stats()
+
+        unchanged = 0
 
         for repo in repositories[:20]:  # Limit for rate limiting
             try:
-                owner, repo_name = repo.full_name.split('/')
-                contributors = self.api_client.get_repository_contributors(owner, repo_name)
+                # Contributors only change with pushes; reuse the last run's list
+                if self.state and self.state.is_current(repo.full_name, 'contributors', repo.pushed_at):
+                    contributors = [ContributorData(**c) for c in self.state.get_contributors(repo.full_name)]
+                    unchanged += 1
+                else:
+                    owner, repo_name = repo.full_name.split('/')
+                    contributors = self.api_client.get_repository_contributors(owner, repo_name)
+
+                    # Failed requests come back as an empty list; don't cache that until the next push
+                    if self.state and contributors:
+                        self.state.set_contributors(repo.full_name, [asdict(c) for c in contributors])
+                        self.state.mark_current(repo.full_name, 'contributors', repo.pushed_at)
 
                 if contributors:
                     contributor_patterns[repo.full_name] = contributors
                     logger.info(f"Collected {len(contributors)} contributors for {repo.full_name}")
 
-                time.sleep(0.2)
-
             except Exception as e:
                 logger.error(f"Error collecting contributors for {repo.full_name}: {e}")
                 continue
 
+        if self.state:
+            self.state.save()
+            logger.info(f"Reused contributors of {unchanged} repositories not pushed since the last run")
+
+        cache_stats = self.api_client.user_cache.stats()
+        logger.info(f"User profile cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses "
+                    f"({cache_stats['hits']} API calls saved, {cache_stats['hit_rate']:.0%} hit rate)")
+
         return contributor_patterns
 
+    def collect_commit_activity(self, repositories: List[RepositoryData]) -> Dict[str, List[CommitData]]:
+        """Collect commits made since the last run for repositories"""
+        logger.info("Collecting commit activity")
+
+        commit_activity = {}
+
+        for repo in repositories[:20]:  # Limit for rate limiting
+            try:
+                since = None
+                if self.state:
+                    if self.state.is_current(repo.full_name, 'commits', repo.pushed_at):
+                        continue
+                    since = self.state.get_last_commit_date(repo.full_name)
+
+                owner, repo_name = repo.full_name.split('/')
+                # Commits arrive newest first and the mark moves to the newest, so a capped
+                # incremental fetch would lose the older ones for good; only the first run is capped
+                commits = self.commit_backend.get_repository_commits(owner, repo_name, since=since,
+                                                                     max_items=None if since else 100)
+
+                # `since` is inclusive; commits sharing its timestamp may be new, so compare SHAs
+                seen = set(self.state.get_last_commit_shas(repo.full_name)) if self.state else set()
+                commits = [c for c in commits if c.sha not in seen]
+                if commits:
+                    self.commit_backend.fill_commit_stats(owner, repo_name, commits)
+                    commit_activity[repo.full_name] = commits
+                    logger.info(f"Collected {len(commits)} new commits for {repo.full_name}")
+
+                if self.state:
+                    if commits:
+                        last_date = max(c.date for c in commits)
+                        self.state.set_last_commit(repo.full_name, last_date,
+                                                   [c.sha for c in commits if c.date == last_date])
+                    self.state.mark_current(repo.full_name, 'commits', repo.pushed_at)
+
+            except Exception as e:
+                logger.error(f"Error collecting commits for {repo.full_name}: {e}")
+                continue
+
+        if self.state:
+            self.state.save()
+
+        return commit_activity
+
     def detect_ownership_changes(self, repositories: List[RepositoryData]) -> List[TransferEvent]:
         """Detect potential ownership changes and transfers"""
         logger.info("Detecting ownership changes")
@@ -353,35 +738,17 @@ class DataCollector:
         return transfer_events
 
     def collect_recent_activity(self, organizations: List[str]) -> Dict[str, List[Dict]]:
-        """Collect recent activity from key organizations"""
+        """Collect new activity from key organizations"""
         logger.info("Collecting recent organization activity")
 
-        activities = {}
+        # Only organizations due for a poll, and only events not seen by
+        # earlier runs, compacted and appended to the event log
+        return self.event_ingester.poll_all(organizations)
 
-        for org in organizations[:10]:  # Limit for rate limiting
-            try:
-                events = self.api_client.get_organization_events(org)
-                if events:
-                    activities[org] = events
-                    logger.info(f"Collected {len(events)} events for {org}")
-
-                time.sleep(0.2)
-
-            except Exception as e:
-                logger.error(f"Error collecting activity for {org}: {e}")
-                continue
-
-        return activities
-
-    def save_data_to_json(self, data: Dict, filename: str):
-        """Save collected data to JSON file"""
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        filepath = f'data/{timestamp}_{filename}.json'
-
-        os.makedirs('data', exist_ok=True)
-
-        with open(filepath, 'w') as f:
-            json.dump(data, f, indent=2, default=str)
+    def save_snapshot(self, data: Dict, filename: str):
+        """Save collected data as a Parquet snapshot (compact JSON without pyarrow)"""
+        from github_snapshots import save_collection_snapshot
+        filepath = save_collection_snapshot(data, filename)
 
         logger.info(f"Data saved to {filepath}")
 
@@ -391,7 +758,7 @@ def main():
 
     # Initialize API client
     api_client = GitHubAPIClient()
-    collector = DataCollector(api_client)
+    collector = DataCollector(api_client, CollectionState(os.getenv('COLLECTION_STATE_PATH', 'data/collection_state.json')))
 
     try:
         # Collect top repositories
@@ -401,30 +768,45 @@ def main():
         # Collect contributor patterns
         contributor_patterns = collector.collect_contributor_patterns(repositories)
 
+        # Collect commits made since the last run
+        commit_activity = collector.collect_commit_activity(repositories)
+
         # Detect ownership changes
         transfer_events = collector.detect_ownership_changes(repositories)
 
         # Collect organization activity
-        key_orgs = ['microsoft', 'google', 'meta', 'amazon', 'apple', 'netflix']
-        activities = collector.collect_recent_activity(key_orgs)
+        activities = collector.collect_recent_activity(load_watchlist())
 
         # Prepare data for saving
         collected_data = {
             'timestamp': datetime.now().isoformat(),
             'repositories': [asdict(repo) for repo in repositories],
             'contributor_patterns': {k: [asdict(c) for c in v] for k, v in contributor_patterns.items()},
+            'commit_activity': {k: [asdict(c) for c in v] for k, v in commit_activity.items()},
             'transfer_events': [asdict(event) for event in transfer_events],
             'organization_activities': activities,
             'metadata': {
                 'total_repositories': len(repositories),
                 'total_contributors_analyzed': sum(len(c) for c in contributor_patterns.values()),
+                'new_commits': sum(len(c) for c in commit_activity.values()),
                 'transfer_events_detected': len(transfer_events),
                 'organizations_monitored': len(activities)
             }
         }
 
         # Save data
-        collector.save_data_to_json(collected_data, 'github_ma_intelligence')
+        collector.save_snapshot(collected_data, 'github_ma_intelligence')
+
+        # Upsert the run into the database too, when one is configured
+        from github_storage import CollectionStore
+        store = CollectionStore.from_env()
+        if store:
+            try:
+                store.save_collection(collected_data)
+            except Exception as e:
+                logger.error(f"Failed to persist collection to the database: {e}")
+            finally:
+                store.close()
 
         logger.info("Data collection completed successfully")
 
@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+GitHub M&A Intelligence Event Ingestion
+Polls organization event feeds and appends only unseen events to a compact log
+"""
+
+import os
+import json
+import time
+import logging
+import threading
+from datetime import datetime
+from itertools import takewhile
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from github_state import CollectionState
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WATCHLIST = ('microsoft', 'google', 'meta', 'amazon', 'apple', 'netflix')
+
+# Payload fields worth keeping; full payloads (e.g. pushed commits) are mostly noise here
+COMPACT_PAYLOAD_FIELDS = ('action', 'ref', 'ref_type', 'size', 'forkee', 'member')
+
+def compact_event(event: Dict, org: str) -> Dict:
+    """Reduce a raw GitHub event to the fields the intelligence pipeline uses"""
+    payload = event.get('payload') or {}
+    compact = {
+        'id': event['id'],
+        'type': event['type'],
+        'org': org,
+        'actor': (event.get('actor') or {}).get('login'),
+        'repo': (event.get('repo') or {}).get('name'),
+        'created_at': event.get('created_at')
+    }
+
+    for field in COMPACT_PAYLOAD_FIELDS:
+        value = payload.get(field)
+        if isinstance(value, dict):
+            value = value.get('full_name') or value.get('login')
+        if value is not None:
+            compact[field] = value
+    return compact
+
+class EventLog:
+    """Append-only JSON Lines log of compact organization events"""
+
+    def __init__(self, path: str = 'data/organization_events.jsonl'):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def append(self, events: List[Dict]):
+        if not events:
+            return
+
+        with self._lock:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            with open(self.path, 'a') as f:
+                f.writelines(json.dumps(event, separators=(',', ':')) + '\n' for event in events)
+
+    def iter_events(self, org: Optional[str] = None) -> Iterator[Dict]:
+        """Stream logged events in ingestion order"""
+        if not os.path.exists(self.path):
+            return
+
+        with open(self.path, 'r') as f:
+            for line in f:
+                event = json.loads(line)
+                if org is None or event['org'] == org:
+                    yield event
+
+class EventIngester:
+    """Polls organization event feeds at rates matched to their activity, within a global request budget
+
+    Each organization is polled about once per `target_events_per_poll`
+    events, estimated from an EWMA of its observed event rate and clamped
+    to [min_interval, max_interval], never sooner than X-Poll-Interval.
+    Due organizations are polled most overdue first while a token bucket
+    of `budget_per_hour` polls lasts; the rest wait for the next round.
+    """
+
+    def __init__(self, api_client, log: Optional[EventLog] = None, state: Optional[CollectionState] = None,
+                 min_interval: Optional[float] = None, max_interval: Optional[float] = None,
+                 budget_per_hour: Optional[float] = None, target_events_per_poll: int = 50,
+                 smoothing: float = 0.3, max_events: int = 300):
+        self.api_client = api_client
+        self.log = log or EventLog(os.getenv('ORG_EVENT_LOG_PATH', 'data/organization_events.jsonl'))
+        self.state = state or CollectionState(os.getenv('COLLECTION_STATE_PATH', 'data/collection_state.json'))
+        self.min_interval = min_interval or float(os.getenv('ORG_POLL_MIN_INTERVAL_SECONDS', 60))
+        self.max_interval = max_interval or float(os.getenv('ORG_POLL_MAX_INTERVAL_SECONDS', 3600))
+        self.budget_per_hour = budget_per_hour or float(os.getenv('ORG_POLL_BUDGET_PER_HOUR', 2000))
+        self.target_events_per_poll = target_events_per_poll
+        self.smoothing = smoothing
+        self.max_events = max_events  # GitHub only serves the latest 300 events per feed
+
+        self._budget = self.budget_per_hour  # Bucket starts full so a first pass covers the watchlist
+        self._budget_updated_at = time.time()
+        self._lock = threading.Lock()
+
+        self.polls = 0
+        self.skipped_polls = 0
+        self.deferred_polls = 0
+        self.new_events = 0
+
+    def is_due(self, org: str) -> bool:
+        return time.time() >= (self.state.get_poll_schedule(org)['next_poll_at'] or 0.0)
+
+    def select_due(self, organizations: List[str], force: bool = False) -> List[str]:
+        """Organizations to poll now, most overdue first, as far as the request budget allows"""
+        schedules = {org: self.state.get_poll_schedule(org) for org in dict.fromkeys(organizations)}
+        now = time.time()
+
+        due = [org for org, schedule in schedules.items() if force or now >= (schedule['next_poll_at'] or 0.0)]
+        self.skipped_polls += len(schedules) - len(due)
+        due.sort(key=lambda org: schedules[org]['next_poll_at'] or 0.0)
+
+        with self._lock:
+            self._budget = min(self.budget_per_hour, self._budget + (now - self._budget_updated_at) * self.budget_per_hour / 3600)
+            self._budget_updated_at = now
+
+            allowed = min(len(due), int(self._budget))
+            self._budget -= allowed
+
+        if allowed < len(due):
+            self.deferred_polls += len(due) - allowed
+            logger.info(f"Event polling budget reached; deferring {len(due) - allowed} organizations")
+        return due[:allowed]
+
+    def poll(self, org: str) -> List[Dict]:
+        """Fetch events of an organization not seen before, log them and return them compacted"""
+        # The feed is conditional on its ETag, so an unchanged feed costs one free 304
+        events = self.api_client.iter_organization_events(org, max_items=self.max_events)
+        return self.ingest(org, events)
+
+    def ingest(self, org: str, events: Iterable[Dict]) -> List[Dict]:
+        """Compact, log and mark as seen the events of a newest-first feed that weren't seen before"""
+        # Events arrive newest first; stop paging at the last one already seen
+        last_event_id = self.state.get_last_event_id(org)
+        if last_event_id is not None:
+            events = takewhile(lambda event: int(event['id']) > last_event_id, events)
+        new_events = [compact_event(event, org) for event in events]
+
+        self._schedule(org, new_events)
+        self.polls += 1
+
+        if new_events:
+            # Log oldest first so the file stays in event order
+            self.log.append(new_events[::-1])
+            self.state.set_last_event_id(org, max(int(event['id']) for event in new_events))
+            self.new_events += len(new_events)
+
+        return new_events
+
+    def _schedule(self, org: str, new_events: List[Dict]):
+        """Update an organization's event rate estimate and pick its next poll time"""
+        now = time.time()
+        schedule = self.state.get_poll_schedule(org)
+
+        if schedule['last_polled_at'] is not None:
+            observed = len(new_events) / max(now - schedule['last_polled_at'], 1.0)
+        else:
+            observed = _event_rate(new_events)
+
+        rate = observed if schedule['event_rate'] is None else (
+            self.smoothing * observed + (1 - self.smoothing) * schedule['event_rate']
+        )
+
+        interval = self.target_events_per_poll / rate if rate > 0 else self.max_interval
+        interval = min(max(interval, self.min_interval), self.max_interval)
+
+        feed_url = f'{self.api_client.base_url}/orgs/{org}/events'
+        interval = max(interval, self.api_client.poll_intervals.get(feed_url, 0))
+
+        self.state.set_poll_schedule(org, now + interval, now, rate)
+
+    def poll_all(self, organizations: List[str], force: bool = False) -> Dict[str, List[Dict]]:
+        """Poll due organizations within the budget and return the new events of those that had any"""
+        activities = {}
+        for org in self.select_due(organizations, force):
+            try:
+                events = self.poll(org)
+                if events:
+                    activities[org] = events
+                    logger.info(f"Ingested {len(events)} new events for {org}")
+            except Exception as e:
+                logger.error(f"Error ingesting events for {org}: {e}")
+
+        self.state.save()
+        return activities
+
+    def stream(self, organizations: List[str], stop: Optional[threading.Event] = None
+               ) -> Iterator[Tuple[str, List[Dict]]]:
+        """Poll organizations as they become due until stopped, yielding new events per organization"""
+        stop = stop or threading.Event()
+        while not stop.is_set():
+            for org, events in self.poll_all(organizations).items():
+                yield org, events
+
+            next_due = min((self.state.get_poll_schedule(org)['next_poll_at'] or 0.0 for org in organizations),
+                           default=time.time())
+            stop.wait(max(next_due - time.time(), 1.0))
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            'polls': self.polls,
+            'skipped_polls': self.skipped_polls,
+            'deferred_polls': self.deferred_polls,
+            'new_events': self.new_events
+        }
+
+def _event_rate(events: List[Dict]) -> float:
+    """Events per second over the span of a newest-first batch of compact events"""
+    try:
+        newest = datetime.fromisoformat(events[0]['created_at'].replace('Z', '+00:00'))
+        oldest = datetime.fromisoformat(events[-1]['created_at'].replace('Z', '+00:00'))
+    except (IndexError, AttributeError, ValueError):
+        return 0.0
+    return (len(events) - 1) / max((newest - oldest).total_seconds(), 1.0)
+
+def load_watchlist(path: Optional[str] = None) -> List[str]:
+    """Organizations to monitor, from ORG_WATCHLIST_PATH (one per line) or ORG_WATCHLIST (comma-separated)"""
+    path = path or os.getenv('ORG_WATCHLIST_PATH')
+    if path and os.path.exists(path):
+        with open(path, 'r') as f:
+            organizations = [line.split('#', 1)[0].strip() for line in f]
+    else:
+        organizations = os.getenv('ORG_WATCHLIST', ','.join(DEFAULT_WATCHLIST)).split(',')
+    return list(dict.fromkeys(org.strip() for org in organizations if org.strip()))
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+GitHub M&A Intelligence Git Backend
+Commit analytics from local bare clones instead of the GitHub API
+"""
+
+import os
+import logging
+import threading
+import subprocess
+from collections import defaultdict
+from typing import Dict, Iterator, List, Optional
+from github_data_collector import CommitData
+
+logger = logging.getLogger(__name__)
+
+# Fields of one commit in `git log` output; each record starts with RS and its fields end with US
+_LOG_FORMAT = '%x1e%H%x1f%an%x1f%cn%x1f%cd%x1f%B%x1f'
+_DATE_FORMAT = '--date=format-local:%Y-%m-%dT%H:%M:%SZ'  # REST-style UTC timestamps
+
+class GitRepositoryCache:
+    """Bare, optionally partial, clones of tracked repositories kept up to date by incremental fetches"""
+
+    def __init__(self, cache_dir: str = 'data/git', url_template: str = 'https://github.com/{full_name}.git',
+                 clone_filter: Optional[str] = None, git_timeout: float = 1800):
+        self.cache_dir = cache_dir
+        self.url_template = url_template
+        # Full clones by default: `git log --numstat` needs every blob it diffs, and a
+        # blob:none clone fetches those lazily over the network, one commit at a time
+        self.clone_filter = clone_filter
+        self.git_timeout = git_timeout
+
+        self._locks = defaultdict(threading.Lock)
+        self._locks_lock = threading.Lock()
+
+    def repo_path(self, full_name: str) -> str:
+        return os.path.join(self.cache_dir, f'{full_name}.git')
+
+    def git(self, full_name: str, *args: str) -> str:
+        """Run a git command in a repository's clone and return its output"""
+        return self._run('--git-dir', self.repo_path(full_name), *args)
+
+    def sync(self, full_name: str) -> str:
+        """Clone a repository on first use, otherwise fetch only what changed; returns the clone path"""
+        with self._locks_lock:
+            lock = self._locks[full_name]
+
+        with lock:
+            path = self.repo_path(full_name)
+            if not os.path.exists(path):
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                args = ['clone', '--bare', '--quiet']
+                if self.clone_filter:
+                    args.append(f'--filter={self.clone_filter}')
+                self._run(*args, self.url_template.format(full_name=full_name), path)
+
+                # Bare clones don't track their remote; fetch branches straight into refs/heads
+                self.git(full_name, 'config', 'remote.origin.fetch', '+refs/heads/*:refs/heads/*')
+                logger.info(f"Cloned {full_name} into {path}")
+            else:
+                self.git(full_name, 'fetch', '--quiet', '--prune', 'origin')
+            return path
+
+    def _run(self, *args: str) -> str:
+        env = {**os.environ, 'TZ': 'UTC', 'GIT_TERMINAL_PROMPT': '0'}
+        result = subprocess.run(['git', *args], capture_output=True, text=True, env=env,
+                                timeout=self.git_timeout, check=True)
+        return result.stdout
+
+class GitCommitBackend:
+    """Drop-in replacement for the API client's commit methods, computed from local clones"""
+
+    def __init__(self, repositories: GitRepositoryCache):
+        self.repositories = repositories
+
+    @classmethod
+    def from_env(cls) -> 'GitCommitBackend':
+        return cls(GitRepositoryCache(
+            cache_dir=os.getenv('GIT_CACHE_DIR', 'data/git'),
+            url_template=os.getenv('GIT_CLONE_URL_TEMPLATE', 'https://github.com/{full_name}.git'),
+            clone_filter=os.getenv('GIT_CLONE_FILTER') or None
+        ))
+
+    def iter_repository_commits(self, owner: str, repo: str, since: Optional[str] = None,
+                                max_items: Optional[int] = None) -> Iterator[CommitData]:
+        """Stream commits of the default branch with numstat diff stats, newest first"""
+        full_name = f'{owner}/{repo}'
+        self.repositories.sync(full_name)
+
+        args = ['git', '--git-dir', self.repositories.repo_path(full_name), 'log', 'HEAD',
+                '--numstat', '--no-renames', f'--format={_LOG_FORMAT}', _DATE_FORMAT]
+        if since:
+            args.append(f'--since={since}')
+        if max_items is not None:
+            args.append(f'--max-count={max_items}')
+
+        # Stream the log so deep histories never sit in memory as a whole
+        env = {**os.environ, 'TZ': 'UTC', 'GIT_TERMINAL_PROMPT': '0'}
+        with subprocess.Popen(args, stdout=subprocess.PIPE, text=True, env=env) as process:
+            record = ''
+            for line in process.stdout:
+                if line.startswith('\x1e') and record:
+                    yield self._commit_from_record(record)
+                    record = ''
+                record += line
+            if record:
+                yield self._commit_from_record(record)
+
+        if process.returncode:
+            raise subprocess.CalledProcessError(process.returncode, args)
+
+    def get_repository_commits(self, owner: str, repo: str, since: Optional[str] = None,
+                               max_items: Optional[int] = 100) -> List[CommitData]:
+        """Get repository commits"""
+        return list(self.iter_repository_commits(owner, repo, since, max_items))
+
+    def fill_commit_stats(self, owner: str, repo: str, commits: List[CommitData]) -> List[CommitData]:
+        """Commits from local clones already carry their numstat diff stats"""
+        return commits
+
+    def commit_summary(self, owner: str, repo: str, since: Optional[str] = None) -> Dict:
+        """Commit count and author/committer sets of the default branch"""
+        full_name = f'{owner}/{repo}'
+        self.repositories.sync(full_name)
+
+        args = ['log', 'HEAD', '--format=%an%x1f%cn']
+        if since:
+            args.append(f'--since={since}')
+
+        commits = 0
+        authors, committers = set(), set()
+        for line in self.repositories.git(full_name, *args).splitlines():
+            author, committer = line.split('\x1f')
+            authors.add(author)
+            committers.add(committer)
+            commits += 1
+
+        return {'commits': commits, 'authors': sorted(authors), 'committers': sorted(committers)}
+
+    @staticmethod
+    def _commit_from_record(record: str) -> CommitData:
+        sha, author, committer, date, message, numstat = record.lstrip('\x1e').split('\x1f', 5)
+
+        additions = deletions = files_changed = 0
+        for line in numstat.strip().splitlines():
+            added, deleted, _ = line.split('\t', 2)
+            files_changed += 1
+            # Binary files report '-' for both counts
+            if added != '-':
+                additions += int(added)
+                deletions += int(deleted)
+
+        return CommitData(
+            sha=sha,
+            author=author,  # Author name; clones don't know GitHub logins
+            committer=committer,
+            message=message.strip(),
+            date=date,
+            additions=additions,
+            deletions=deletions,
+            files_changed=files_changed
+        )
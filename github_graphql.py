@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+GitHub M&A Intelligence GraphQL Queries
+Batched GraphQL queries and their mapping onto the collector dataclasses
+"""
+
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+from github_data_collector import RepositoryData, ContributorData
+
+# One query returns metadata and recent commit authors for a page of search results
+REPOSITORY_SEARCH_QUERY = """
+query($query: String!, $first: Int!, $after: String, $historyLength: Int!) {
+  search(query: $query, type: REPOSITORY, first: $first, after: $after) {
+    pageInfo { hasNextPage endCursor }
+    nodes {
+      ... on Repository {
+        databaseId
+        name
+        nameWithOwner
+        owner { login __typename }
+        description
+        primaryLanguage { name }
+        stargazerCount
+        forkCount
+        diskUsage
+        createdAt
+        updatedAt
+        pushedAt
+        repositoryTopics(first: 20) { nodes { topic { name } } }
+        licenseInfo { name }
+        isArchived
+        isDisabled
+        visibility
+        defaultBranchRef {
+          target {
+            ... on Commit {
+              history(first: $historyLength) {
+                nodes {
+                  author {
+                    user {
+                      databaseId
+                      login
+                      company
+                      location
+                      isHireable
+                      createdAt
+                      followers { totalCount }
+                      following { totalCount }
+                      repositories(privacy: PUBLIC) { totalCount }
+                    }
+                  }
+                }
+              }
+            }
+          }
+        }
+      }
+    }
+  }
+}
+"""
+
+def repository_from_node(node: Dict) -> RepositoryData:
+    """Map a GraphQL Repository node onto RepositoryData"""
+    return RepositoryData(
+        id=node['databaseId'],
+        name=node['name'],
+        full_name=node['nameWithOwner'],
+        owner=node['owner']['login'],
+        owner_type=node['owner']['__typename'],
+        description=node.get('description') or '',
+        language=(node.get('primaryLanguage') or {}).get('name', 'Unknown'),
+        stars=node['stargazerCount'],
+        forks=node['forkCount'],
+        watchers=node['stargazerCount'],  # REST watchers_count mirrors stargazers_count
+        size=node['diskUsage'] or 0,
+        created_at=node['createdAt'],
+        updated_at=node['updatedAt'],
+        pushed_at=node['pushedAt'],
+        topics=[t['topic']['name'] for t in node['repositoryTopics']['nodes']],
+        license=(node.get('licenseInfo') or {}).get('name'),
+        archived=node['isArchived'],
+        disabled=node['isDisabled'],
+        visibility=node['visibility'].lower()
+    )
+
+def contributors_from_node(node: Dict, max_contributors: Optional[int] = None) -> List[ContributorData]:
+    """Contributors of a Repository node, ranked by commits in the fetched history"""
+    history = ((node.get('defaultBranchRef') or {}).get('target') or {}).get('history') or {}
+
+    users = {}
+    commits = Counter()
+    for commit in history.get('nodes', []):
+        user = (commit.get('author') or {}).get('user')
+        if user:
+            users[user['login']] = user
+            commits[user['login']] += 1
+
+    return [
+        ContributorData(
+            username=login,
+            contributions=count,
+            company=users[login].get('company'),
+            location=users[login].get('location'),
+            hireable=bool(users[login].get('isHireable')),
+            public_repos=users[login]['repositories']['totalCount'],
+            followers=users[login]['followers']['totalCount'],
+            following=users[login]['following']['totalCount'],
+            created_at=users[login].get('createdAt', ''),
+            id=users[login].get('databaseId')
+        )
+        for login, count in commits.most_common(max_contributors)
+    ]
+
+def commit_stats_query(count: int) -> str:
+    """Query for the diff stats of `count` commits of one repository, passed as $sha0..$shaN"""
+    declarations = ', '.join(f'$sha{i}: GitObjectID!' for i in range(count))
+    objects = '\n'.join(
+        f'    c{i}: object(oid: $sha{i}) {{ ... on Commit {{ oid additions deletions changedFilesIfAvailable }} }}'
+        for i in range(count)
+    )
+    return f"query($owner: String!, $name: String!, {declarations}) {{\n  repository(owner: $owner, name: $name) {{\n{objects}\n  }}\n}}"
+
+def commit_stats_from_data(data: Dict) -> Dict[str, Tuple[int, int, int]]:
+    """Map a commit_stats_query result onto (additions, deletions, files_changed) by SHA"""
+    stats = {}
+    for node in (data.get('repository') or {}).values():
+        # changedFilesIfAvailable is null for commits too large to diff
+        if node and node.get('changedFilesIfAvailable') is not None:
+            stats[node['oid']] = (node['additions'], node['deletions'], node['changedFilesIfAvailable'])
+    return stats
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+GitHub M&A Intelligence History
+Per-repository time series of collection snapshots for temporal features
+"""
+
+import logging
+from bisect import bisect_left
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+def _timestamp(value) -> str:
+    # Snapshot times compare as ISO strings; databases may hand back datetimes
+    return value.isoformat() if hasattr(value, 'isoformat') else str(value)
+
+class RepositoryHistory:
+    """Snapshots of every repository kept in time order, with binary-searched window lookups"""
+
+    def __init__(self):
+        self._timestamps: Dict[str, List[str]] = defaultdict(list)
+        self._points: Dict[str, List[Dict]] = defaultdict(list)
+
+    def __len__(self) -> int:
+        return len(self._points)
+
+    def add(self, full_name: str, timestamp, stars: int, forks: Optional[int] = None,
+            watchers: Optional[int] = None, commits: Optional[List[Dict]] = None):
+        """Record a repository snapshot; snapshots may arrive in any order"""
+        timestamp = _timestamp(timestamp)
+        timestamps = self._timestamps[full_name]
+        point = {'timestamp': timestamp, 'stars': stars, 'forks': forks, 'watchers': watchers, 'commits': commits or []}
+
+        # Appending is the common case, since snapshots are mostly loaded oldest first
+        index = len(timestamps) if not timestamps or timestamps[-1] <= timestamp else bisect_left(timestamps, timestamp)
+        timestamps.insert(index, timestamp)
+        self._points[full_name].insert(index, point)
+
+    def window(self, full_name: str, start: Optional[str] = None, end: Optional[str] = None) -> List[Dict]:
+        """Snapshots of a repository taken in [start, end), oldest first"""
+        timestamps = self._timestamps.get(full_name)
+        if not timestamps:
+            return []
+
+        lo = bisect_left(timestamps, start) if start else 0
+        hi = bisect_left(timestamps, end) if end else len(timestamps)
+        return self._points[full_name][lo:hi]
+
+    def windows(self, full_names: Iterable[str], start: Optional[str] = None,
+                end: Optional[str] = None) -> Dict[str, List[Dict]]:
+        """window() for many repositories at once"""
+        return {full_name: self.window(full_name, start, end) for full_name in full_names}
+
+    def to_frame(self, full_names: Iterable[str], start: Optional[str] = None,
+                 end: Optional[str] = None) -> pd.DataFrame:
+        """Windows of many repositories as one row per snapshot, for batch feature engineering"""
+        rows = []
+        for full_name in full_names:
+            for point in self.window(full_name, start, end):
+                # ISO dates of one source sort chronologically as strings
+                dates = [commit['date'] for commit in point['commits'] if commit.get('date')]
+                rows.append((full_name, point['timestamp'], point['stars'], len(dates),
+                             min(dates) if dates else None, max(dates) if dates else None))
+
+        return pd.DataFrame(rows, columns=['full_name', 'timestamp', 'stars', 'commit_count',
+                                           'first_commit_at', 'last_commit_at'])
+
+    @classmethod
+    def from_snapshots(cls, store, since: Optional[str] = None) -> 'RepositoryHistory':
+        """Build from the Parquet snapshot store in one columnar read per entity"""
+        repositories = store.read('repositories', columns=['full_name', 'stars', 'forks', 'watchers', 'collected_at'],
+                                  since=since)
+        commits = store.read('commits', columns=['repository', 'date', 'collected_at'], since=since)
+
+        # Commits are stored per run, so each snapshot carries the commits collected with it
+        run_commits = defaultdict(list)
+        for repository, date, collected_at in commits.itertuples(index=False):
+            run_commits[(repository, collected_at)].append({'date': date})
+
+        history = cls()
+        for full_name, stars, forks, watchers, collected_at in (
+                repositories.sort_values('collected_at').itertuples(index=False)):
+            history.add(full_name, collected_at, int(stars), int(forks), int(watchers),
+                        run_commits.get((full_name, collected_at)))
+        return history
+
+    @classmethod
+    def from_database(cls, store, since: Optional[str] = None) -> 'RepositoryHistory':
+        """Build from the repository_snapshots table"""
+        history = cls()
+        for row in store.load_snapshots(since):
+            history.add(row['full_name'], row['snapshot_date'], row['stars'], row['forks'], row['watchers'])
+        return history
+
+    @classmethod
+    def load(cls, days: int = 90) -> 'RepositoryHistory':
+        """The last `days` of history, from Parquet snapshots if any, else the configured database"""
+        from github_snapshots import SnapshotStore
+        from github_storage import CollectionStore
+
+        since = (datetime.now() - timedelta(days=days)).isoformat()
+
+        if SnapshotStore.available():
+            store = SnapshotStore.from_env()
+            if store.runs():
+                history = cls.from_snapshots(store, since)
+                logger.info(f"Loaded snapshot history for {len(history)} repositories")
+                return history
+
+        database = CollectionStore.from_env()
+        if database:
+            try:
+                history = cls.from_database(database, since)
+                logger.info(f"Loaded database history for {len(history)} repositories")
+                return history
+            finally:
+                database.close()
+
+        return cls()
@@ -5,29 +5,71 @@ Anomaly detection, pattern recognition, and acquisition probability scoring
 """
 
 import os
+import copy
 import json
 import logging
 import numpy as np
 import pandas as pd
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple, Any
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple, Any
 from dataclasses import dataclass
 from sklearn.ensemble import IsolationForest, RandomForestClassifier
 from sklearn.preprocessing import StandardScaler, LabelEncoder
 from sklearn.model_selection import train_test_split
 from sklearn.metrics import classification_report, roc_auc_score
-import tensorflow as tf
-from tensorflow import keras
-from tensorflow.keras import layers
-import joblib
 from collections import defaultdict
 import warnings
+
+# Snapshot, history and model stores pull in the collector stack; they are imported where used
+if TYPE_CHECKING:
+    from github_history import RepositoryHistory
+    from github_models import ModelStore
+
 warnings.filterwarnings('ignore')
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Days of snapshot history temporal features look back over
+HISTORY_WINDOW_DAYS = 90
+
+# Snapshot columns the feature engineering reads
+ANALYSIS_COLUMNS = {
+    'repositories': ['id', 'name', 'full_name', 'language', 'stars', 'forks', 'watchers'],
+    'contributors': ['username', 'company']
+}
+
+# MLFeatures columns models are trained and scored on, in matrix column order
+FEATURE_COLUMNS = [
+    'stars_growth_rate', 'contributor_diversity', 'commit_frequency',
+    'cross_company_contributions', 'language_consistency', 'organization_size',
+    'recent_activity_score', 'network_centrality', 'license_changes', 'topic_changes'
+]
+
+# Company columns the acquisition model is trained and scored on
+ACQUISITION_FEATURE_COLUMNS = [
+    'stars', 'forks', 'contributors_count', 'commit_frequency',
+    'company_age_years', 'big_tech_contributors', 'funding_rounds'
+]
+
+# Repository columns models are trained from; their contents fingerprint the training data
+TRAINING_COLUMNS = ['id', 'name', 'language', 'stars', 'forks']
+
+# Saved incremental anomaly model, and the history sample that seeds it
+ANOMALY_WINDOW_MODEL = 'anomaly_window'
+WINDOW_SEED_ROWS = 10000
+
+BIG_TECH_COMPANIES = {'Google', 'Microsoft', 'Meta', 'Amazon', 'Apple', 'Netflix', 'Tesla'}
+
+# Anomaly indicators, in the order their flags are checked
+ANOMALY_INDICATORS = (
+    'Unusual stars growth rate',
+    'High cross-company contributions',
+    'Abnormally high commit frequency',
+    'Sudden increase in recent activity'
+)
+
 @dataclass
 class MLFeatures:
     """Machine learning features for repository analysis"""
@@ -63,6 +105,10 @@ class AcquisitionPrediction:
     timeline_estimate: str
     key_signals: List[str]
 
+def features_matrix(features: List[MLFeatures]) -> np.ndarray:
+    """Stack MLFeatures into a float32 matrix in FEATURE_COLUMNS order"""
+    return np.array([[getattr(f, name) for name in FEATURE_COLUMNS] for f in features], dtype=np.float32).reshape(-1, len(FEATURE_COLUMNS))
+
 class FeatureEngineer:
     """Feature engineering for ML models"""
 
@@ -134,9 +180,8 @@ class FeatureEngineer:
         features['contributor_diversity'] = unique_companies / len(contributors)
 
         # Cross-company contributions
-        big_tech_companies = {'Google', 'Microsoft', 'Meta', 'Amazon', 'Apple', 'Netflix', 'Tesla'}
         cross_company_contribs = sum(1 for c in contributors
-                                   if c.get('company') and c.get('company') in big_tech_companies)
+                                   if c.get('company') and c.get('company') in BIG_TECH_COMPANIES)
         features['cross_company_contributions'] = cross_company_contribs / len(contributors)
 
         # Organization size indicator
@@ -184,17 +229,99 @@ class FeatureEngineer:
             topic_changes=repo_features['topic_changes']
         )
 
-class AnomalyDetector:
-    """Anomaly detection for repository activity"""
+    def build_feature_matrix(self, repos_df: pd.DataFrame, contributors_df: pd.DataFrame,
+                             history_df: pd.DataFrame) -> np.ndarray:
+        """Compute FEATURE_COLUMNS for every repository at once as a float32 matrix in repos_df row order
+
+        repos_df: full_name, stars, forks, watchers
+        contributors_df: repository, company; one row per contributor
+        history_df: full_name, timestamp, stars, commit_count, first_commit_at,
+            last_commit_at; one row per snapshot (see RepositoryHistory.to_frame)
+
+        Same definitions as create_feature_vector, with per-object loops
+        replaced by grouped aggregations.
+        """
+        names = repos_df['full_name']
+        matrix = np.zeros((len(repos_df), len(FEATURE_COLUMNS)), dtype=np.float32)
+        column = {name: i for i, name in enumerate(FEATURE_COLUMNS)}
+
+        if len(history_df):
+            history = history_df.sort_values(['full_name', 'timestamp'])
+            from_end = history.groupby('full_name').cumcount(ascending=False)
+
+            # Stars growth against the mean of the last 30 snapshots
+            last_30 = history[from_end < 30].groupby('full_name')['stars'].agg(['mean', 'count'])
+            mean_stars = names.map(last_30['mean']).to_numpy(dtype=np.float64)
+            enough = (names.map(last_30['count']).fillna(0).to_numpy() > 1) & (mean_stars > 0)
+            current = repos_df['stars'].to_numpy(dtype=np.float64)
+            matrix[enough, column['stars_growth_rate']] = (current[enough] - mean_stars[enough]) / mean_stars[enough]
+
+            # Mean hours between consecutive commits over the last 90 snapshots
+            # telescopes to (last - first) / (count - 1)
+            last_90 = history[from_end < 90].assign(
+                first_commit_at=lambda df: pd.to_datetime(df['first_commit_at'], utc=True),
+                last_commit_at=lambda df: pd.to_datetime(df['last_commit_at'], utc=True)
+            ).groupby('full_name').agg(commits=('commit_count', 'sum'), first=('first_commit_at', 'min'),
+                                       last=('last_commit_at', 'max'))
+            commits = names.map(last_90['commits']).fillna(0).to_numpy()
+            span_hours = (names.map(last_90['last']) - names.map(last_90['first'])).dt.total_seconds().to_numpy() / 3600
+            frequent = commits > 1
+            mean_gap = span_hours[frequent] / (commits[frequent] - 1)
+            matrix[frequent, column['commit_frequency']] = 1.0 / np.maximum(mean_gap, 1.0)
+
+            # Share of the last 7 snapshots that brought commits
+            last_7 = history[(from_end < 7) & (history['commit_count'] > 0)].groupby('full_name').size()
+            matrix[:, column['recent_activity_score']] = np.minimum(names.map(last_7).fillna(0).to_numpy() / 7.0, 1.0)
+
+        if len(contributors_df):
+            companies = contributors_df['company'].replace('', np.nan)
+            grouped = contributors_df.assign(company=companies,
+                                             big_tech=companies.isin(BIG_TECH_COMPANIES)).groupby('repository')
+            size = names.map(grouped.size()).fillna(0).to_numpy()
+            has_contributors = size > 0
+            diversity = names.map(grouped['company'].nunique()).fillna(0).to_numpy()
+            big_tech = names.map(grouped['big_tech'].sum()).fillna(0).to_numpy()
+
+            matrix[has_contributors, column['contributor_diversity']] = diversity[has_contributors] / size[has_contributors]
+            matrix[has_contributors, column['cross_company_contributions']] = big_tech[has_contributors] / size[has_contributors]
+            matrix[:, column['organization_size']] = size
+
+        matrix[:, column['language_consistency']] = 1.0  # Placeholder, as in extract_repository_features
+        reach = repos_df[['stars', 'forks', 'watchers']].fillna(0).sum(axis=1).to_numpy(dtype=np.float64)
+        matrix[:, column['network_centrality']] = np.log1p(reach)
+
+        return matrix
 
-    def __init__(self):
+class AnomalyDetector:
+    """Anomaly detection for repository activity
+
+    Besides a baseline forest fitted on all history, the detector can be
+    trained incrementally with partial_fit: each call fits a small forest
+    on just the new rows and the last `window` forests score together, so
+    the cost of an update depends on the batch, never on the history. The
+    scaler is updated online; each forest keeps the scaler state it was
+    fitted with, since its splits are in those units.
+    """
+
+    def __init__(self, chunk_size: int = 10000, window: int = 8, trees_per_update: int = 25,
+                 contamination: float = 0.1):
         self.isolation_forest = IsolationForest(
-            contamination=0.1,
+            contamination=contamination,
             random_state=42,
             n_estimators=100
         )
         self.scaler = StandardScaler()
         self.is_trained = False
+        self.chunk_size = chunk_size  # Rows scaled and scored per call
+
+        if window < 1:
+            raise ValueError(f"Anomaly detection window must hold at least one forest, got {window}")
+        self.window = window
+        self.trees_per_update = trees_per_update
+        self.contamination = contamination
+        self.window_forests: List[Tuple[StandardScaler, IsolationForest]] = []
+        self.window_offset = 0.0
+        self.updates = 0
 
     def train_baseline_model(self, historical_features: List[MLFeatures]):
         """Train anomaly detection model on historical data"""
@@ -206,14 +333,7 @@ class AnomalyDetector:
         feature_dicts = [vars(f) for f in historical_features]
         df = pd.DataFrame(feature_dicts)
 
-        # Select numerical features
-        numerical_features = [
-            'stars_growth_rate', 'contributor_diversity', 'commit_frequency',
-            'cross_company_contributions', 'language_consistency', 'organization_size',
-            'recent_activity_score', 'network_centrality', 'license_changes', 'topic_changes'
-        ]
-
-        X = df[numerical_features].fillna(0)
+        X = df[FEATURE_COLUMNS].fillna(0).to_numpy(dtype=np.float32)
 
         # Scale features
         X_scaled = self.scaler.fit_transform(X)
@@ -224,89 +344,132 @@ class AnomalyDetector:
 
         logger.info(f"Trained anomaly detection model on {len(historical_features)} samples")
 
+    def partial_fit(self, matrix: np.ndarray):
+        """Add a forest fitted on new feature rows to the window, retiring the oldest beyond it"""
+        X = np.nan_to_num(np.asarray(matrix, dtype=np.float32))
+        if not len(X):
+            return
+
+        self.scaler.partial_fit(X)
+        forest = IsolationForest(
+            n_estimators=self.trees_per_update,
+            max_samples=min(256, len(X)),
+            random_state=42 + self.updates
+        ).fit(self.scaler.transform(X))
+
+        self.window_forests.append((copy.deepcopy(self.scaler), forest))
+        self.window_forests = self.window_forests[-self.window:]
+        self.updates += 1
+
+        # Like IsolationForest's offset_, the score below which the
+        # `contamination` share of (here: the newest) training rows falls
+        self.window_offset = float(np.percentile(self._window_scores(X), 100 * self.contamination))
+        self.is_trained = True
+
+        logger.info(f"Updated anomaly detection window with {len(X)} samples "
+                    f"({len(self.window_forests)} forests, {self.updates} updates)")
+
+    def _window_scores(self, X: np.ndarray) -> np.ndarray:
+        return np.mean([forest.score_samples(scaler.transform(X)) for scaler, forest in self.window_forests], axis=0)
+
+    def to_artifact(self) -> Dict:
+        return {
+            'scaler': self.scaler,
+            'estimator': self.isolation_forest,
+            'window_forests': self.window_forests,
+            'window_offset': self.window_offset,
+            'updates': self.updates,
+            'feature_columns': FEATURE_COLUMNS
+        }
+
+    def load_artifact(self, artifact: Dict):
+        self.scaler = artifact['scaler']
+        self.isolation_forest = artifact['estimator']
+        self.window_forests = list(artifact.get('window_forests', []))
+        self.window_offset = artifact.get('window_offset', 0.0)
+        self.updates = artifact.get('updates', 0)
+        self.is_trained = True
+
     def detect_anomalies(self, current_features: List[MLFeatures]) -> List[AnomalyScore]:
         """Detect anomalies in current repository data"""
+        return self.detect_anomalies_matrix([f.repo_id for f in current_features], features_matrix(current_features))
+
+    def detect_anomalies_matrix(self, repo_ids: List[int], matrix: np.ndarray) -> List[AnomalyScore]:
+        """Detect anomalies for the rows of a feature matrix in FEATURE_COLUMNS order"""
         if not self.is_trained:
             logger.warning("Model not trained, cannot detect anomalies")
             return []
 
-        anomaly_scores = []
-
-        for features in current_features:
-            # Convert to feature vector
-            feature_dict = vars(features)
-            feature_values = [
-                feature_dict['stars_growth_rate'],
-                feature_dict['contributor_diversity'],
-                feature_dict['commit_frequency'],
-                feature_dict['cross_company_contributions'],
-                feature_dict['language_consistency'],
-                feature_dict['organization_size'],
-                feature_dict['recent_activity_score'],
-                feature_dict['network_centrality'],
-                feature_dict['license_changes'],
-                feature_dict['topic_changes']
-            ]
-
-            # Scale features
-            X_scaled = self.scaler.transform([feature_values])
-
-            # Get anomaly score (-1 for anomalies, 1 for normal)
-            anomaly_score = self.isolation_forest.decision_function(X_scaled)[0]
-            prediction = self.isolation_forest.predict(X_scaled)[0]
-
-            # Convert to positive anomaly score (higher = more anomalous)
-            normalized_score = (anomaly_score + 1) / 2  # Convert from [-1,1] to [0,1]
-
-            # Determine anomaly type and risk level
-            anomaly_type, risk_level, indicators = self._classify_anomaly(features, normalized_score)
-
-            anomaly_scores.append(AnomalyScore(
-                repo_name=f"repo_{features.repo_id}",
+        if not len(matrix):
+            return []
+
+        # Get anomaly scores (negative for anomalies, positive for normal)
+        anomaly_scores = self.score_matrix(matrix)
+
+        # Convert to positive anomaly score (higher = more anomalous)
+        normalized_scores = (anomaly_scores + 1) / 2  # Convert from [-1,1] to [0,1]
+
+        # Determine anomaly type and risk level
+        anomaly_types, risk_levels, indicators = self._classify_anomalies(matrix, normalized_scores)
+
+        return [
+            AnomalyScore(
+                repo_name=f"repo_{repo_id}",
                 anomaly_score=normalized_score,
                 confidence=abs(anomaly_score),
                 anomaly_type=anomaly_type,
                 risk_level=risk_level,
-                indicators=indicators
-            ))
+                indicators=list(repo_indicators)
+            )
+            for repo_id, anomaly_score, normalized_score, anomaly_type, risk_level, repo_indicators in zip(
+                repo_ids, anomaly_scores.tolist(), normalized_scores.tolist(),
+                anomaly_types.tolist(), risk_levels.tolist(), indicators
+            )
+        ]
 
-        return anomaly_scores
+    def score_matrix(self, matrix: np.ndarray) -> np.ndarray:
+        """Isolation forest decision scores of a feature matrix, one scaling and scoring call per chunk"""
+        scores = np.empty(len(matrix), dtype=np.float64)
+        for start in range(0, len(matrix), self.chunk_size):
+            chunk = matrix[start:start + self.chunk_size]
+            if self.window_forests:
+                scores[start:start + self.chunk_size] = self._window_scores(chunk) - self.window_offset
+                continue
 
-    def _classify_anomaly(self, features: MLFeatures, score: float) -> Tuple[str, str, List[str]]:
-        """Classify the type of anomaly detected"""
-        indicators = []
+            X_scaled = self.scaler.transform(chunk)
+            # decision_function is score_samples shifted by the fitted offset
+            scores[start:start + self.chunk_size] = self.isolation_forest.score_samples(X_scaled) - self.isolation_forest.offset_
+        return scores
 
-        if score > 0.7:
-            risk_level = "HIGH"
-        elif score > 0.5:
-            risk_level = "MEDIUM"
-        else:
-            risk_level = "LOW"
+    def _classify_anomalies(self, matrix: np.ndarray, scores: np.ndarray) -> Tuple[np.ndarray, np.ndarray, List[Tuple[str, ...]]]:
+        """Classify the type of anomaly detected for every row at once"""
+        risk_levels = np.select([scores > 0.7, scores > 0.5], ['HIGH', 'MEDIUM'], 'LOW')
 
         # Analyze feature contributions
-        if features.stars_growth_rate > 2.0:
-            indicators.append("Unusual stars growth rate")
-        if features.cross_company_contributions > 0.3:
-            indicators.append("High cross-company contributions")
-        if features.commit_frequency > 10.0:
-            indicators.append("Abnormally high commit frequency")
-        if features.recent_activity_score > 0.8:
-            indicators.append("Sudden increase in recent activity")
-
-        if not indicators:
-            indicators.append("General activity pattern deviation")
+        column = {name: matrix[:, i] for i, name in enumerate(FEATURE_COLUMNS)}
+        rapid_growth = column['stars_growth_rate'] > 2.0
+        cross_company = column['cross_company_contributions'] > 0.3
+        activity_spike = column['commit_frequency'] > 10.0
+        recent_surge = column['recent_activity_score'] > 0.8
 
         # Determine anomaly type
-        if features.cross_company_contributions > 0.3:
-            anomaly_type = "Cross-company collaboration"
-        elif features.stars_growth_rate > 2.0:
-            anomaly_type = "Rapid growth anomaly"
-        elif features.commit_frequency > 10.0:
-            anomaly_type = "Activity spike"
-        else:
-            anomaly_type = "General pattern deviation"
+        anomaly_types = np.select(
+            [cross_company, rapid_growth, activity_spike],
+            ['Cross-company collaboration', 'Rapid growth anomaly', 'Activity spike'],
+            'General pattern deviation'
+        )
 
-        return anomaly_type, risk_level, indicators
+        # Indicator lists depend only on which flags are set; look up each of the 16 combinations
+        flags = np.column_stack([rapid_growth, cross_company, activity_spike, recent_surge])
+        codes = flags.astype(np.int64) @ (1 << np.arange(len(ANOMALY_INDICATORS)))
+        combinations = [
+            tuple(indicator for bit, indicator in enumerate(ANOMALY_INDICATORS) if code >> bit & 1)
+            or ('General activity pattern deviation',)
+            for code in range(1 << len(ANOMALY_INDICATORS))
+        ]
+        indicators = [combinations[code] for code in codes.tolist()]
+
+        return anomaly_types, risk_levels, indicators
 
 class AcquisitionPredictor:
     """Machine learning model for predicting acquisition probability"""
@@ -330,17 +493,11 @@ class AcquisitionPredictor:
         # Convert to DataFrame
         df = pd.DataFrame(training_data)
 
-        # Features for prediction
-        feature_columns = [
-            'stars', 'forks', 'contributors_count', 'commit_frequency',
-            'company_age_years', 'big_tech_contributors', 'funding_rounds'
-        ]
-
         # Create synthetic labels for demonstration
         # In real implementation, this would use historical acquisition data
         df['acquisition_likelihood'] = np.random.choice([0, 1], size=len(df), p=[0.8, 0.2])
 
-        X = df[feature_columns].fillna(0)
+        X = df[ACQUISITION_FEATURE_COLUMNS].fillna(0).to_numpy()
         y = df['acquisition_likelihood']
 
         # Scale features
@@ -352,6 +509,14 @@ class AcquisitionPredictor:
 
         logger.info(f"Trained acquisition prediction model on {len(training_data)} samples")
 
+    def to_artifact(self) -> Dict:
+        return {'scaler': self.scaler, 'estimator': self.classifier, 'feature_columns': ACQUISITION_FEATURE_COLUMNS}
+
+    def load_artifact(self, artifact: Dict):
+        self.scaler = artifact['scaler']
+        self.classifier = artifact['estimator']
+        self.is_trained = True
+
     def predict_acquisition_probability(self, company_data: Dict) -> AcquisitionPrediction:
         """Predict acquisition probability for a company"""
         if not self.is_trained:
@@ -365,15 +530,7 @@ class AcquisitionPredictor:
             )
 
         # Extract features
-        features = [
-            company_data.get('stars', 0),
-            company_data.get('forks', 0),
-            company_data.get('contributors_count', 0),
-            company_data.get('commit_frequency', 0),
-            company_data.get('company_age_years', 0),
-            company_data.get('big_tech_contributors', 0),
-            company_data.get('funding_rounds', 0)
-        ]
+        features = [company_data.get(name, 0) for name in ACQUISITION_FEATURE_COLUMNS]
 
         # Scale features
         X_scaled = self.scaler.transform([features])
@@ -443,40 +600,98 @@ class AcquisitionPredictor:
 class MLAnalyzer:
     """Main ML analysis orchestrator"""
 
-    def __init__(self):
+    def __init__(self, model_store: Optional['ModelStore'] = None, neural_model: Optional[str] = None,
+                 incremental: Optional[bool] = None):
         self.feature_engineer = FeatureEngineer()
-        self.anomaly_detector = AnomalyDetector()
+        self.anomaly_detector = AnomalyDetector(
+            window=int(os.getenv('ML_WINDOW_FORESTS', 8)),
+            trees_per_update=int(os.getenv('ML_TREES_PER_UPDATE', 25))
+        )
+        self.incremental = incremental if incremental is not None else (
+            os.getenv('ML_INCREMENTAL_TRAINING', 'false').lower() == 'true'
+        )
         self.acquisition_predictor = AcquisitionPredictor()
+        if model_store is None:
+            from github_models import ModelStore
+            model_store = ModelStore.from_env()
+        self.model_store = model_store
+        self.neural_model_name = neural_model or os.getenv('ML_NEURAL_MODEL') or None
+        self._neural_model = None
         self.historical_data = []
 
+    def get_neural_model(self):
+        """The configured neural model, built on first use; TensorFlow is only imported then"""
+        if self._neural_model is None and self.neural_model_name:
+            from github_neural import create_neural_model
+            self._neural_model = create_neural_model(self.neural_model_name, input_dim=len(FEATURE_COLUMNS))
+        return self._neural_model
+
     def load_historical_data(self, data_path: str = 'data'):
-        """Load historical data for training"""
+        """Load historical data for training, reusing saved models trained on the same data"""
         if not os.path.exists(data_path):
             logger.warning(f"Historical data path {data_path} does not exist")
             return
 
-        historical_features = []
+        from github_snapshots import SnapshotStore, load_collection_history
+        from github_models import data_fingerprint
+
+        frames = []
+        columns = TRAINING_COLUMNS + ['collected_at']
 
-        # Load historical JSON files
-        for filename in os.listdir(data_path):
-            if filename.endswith('.json'):
-                try:
-                    with open(os.path.join(data_path, filename), 'r') as f:
-                        data = json.load(f)
+        # Columnar snapshots only need the training columns read
+        if SnapshotStore.available():
+            frames.append(SnapshotStore.from_env().read('repositories', columns=columns))
 
-                    if 'repositories' in data:
-                        for repo in data['repositories']:
-                            # Create synthetic historical data for demonstration
-                            historical_features.append(self._create_synthetic_features(repo))
+        # Historical JSON collection files, parsed only when new or changed
+        frames.append(load_collection_history(data_path, columns))
 
-                except Exception as e:
-                    logger.error(f"Error loading {filename}: {e}")
+        # A run saved both as a snapshot and as JSON must count once
+        training_data = pd.concat(frames, ignore_index=True)
+        duplicate = training_data.duplicated(['collected_at', 'id']) & training_data['collected_at'].notna()
+        training_data = training_data[~duplicate].drop(columns='collected_at').reset_index(drop=True)
+        logger.info(f"Loaded historical data for {len(training_data)} repositories")
 
-        if historical_features:
-            self.anomaly_detector.train_baseline_model(historical_features)
-            self.acquisition_predictor.train_model(historical_features)
+        if self.incremental:
+            # The window outlives changes to the training data; it is only ever extended
+            window_artifact = self.model_store.load(ANOMALY_WINDOW_MODEL, ANOMALY_WINDOW_MODEL, FEATURE_COLUMNS)
+            if window_artifact is not None:
+                self.anomaly_detector.load_artifact(window_artifact)
 
-        logger.info(f"Loaded historical data for {len(historical_features)} repositories")
+        if training_data.empty:
+            return
+
+        # Retrain only when the training data changed since the saved models
+        fingerprint = data_fingerprint(training_data)
+        self._load_models(fingerprint)
+
+        # Create synthetic historical data for demonstration
+        if not self.anomaly_detector.is_trained and self.incremental:
+            # Seed the window from a fixed-size sample so seeding cost doesn't grow with history
+            seed = training_data.sample(n=min(len(training_data), WINDOW_SEED_ROWS), random_state=42)
+            self.anomaly_detector.partial_fit(features_matrix([self._create_synthetic_features(repo)
+                                                               for repo in seed.to_dict('records')]))
+            self.model_store.save(ANOMALY_WINDOW_MODEL, ANOMALY_WINDOW_MODEL, self.anomaly_detector.to_artifact())
+
+        elif not self.anomaly_detector.is_trained:
+            repositories = training_data.to_dict('records')
+            self.anomaly_detector.train_baseline_model([self._create_synthetic_features(repo) for repo in repositories])
+            self.model_store.save('anomaly_detector', fingerprint, self.anomaly_detector.to_artifact())
+
+        if not self.acquisition_predictor.is_trained:
+            repositories = training_data.to_dict('records')
+            self.acquisition_predictor.train_model([self._create_synthetic_company_data(repo) for repo in repositories])
+            self.model_store.save('acquisition_predictor', fingerprint, self.acquisition_predictor.to_artifact())
+
+    def _load_models(self, fingerprint: str):
+        """Load the saved models trained on data with this fingerprint, where they exist"""
+        if not self.incremental:
+            anomaly_artifact = self.model_store.load('anomaly_detector', fingerprint, FEATURE_COLUMNS)
+            if anomaly_artifact is not None:
+                self.anomaly_detector.load_artifact(anomaly_artifact)
+
+        acquisition_artifact = self.model_store.load('acquisition_predictor', fingerprint, ACQUISITION_FEATURE_COLUMNS)
+        if acquisition_artifact is not None:
+            self.acquisition_predictor.load_artifact(acquisition_artifact)
 
     def _create_synthetic_features(self, repo_data: Dict) -> MLFeatures:
         """Create synthetic features for demonstration"""
@@ -494,7 +709,24 @@ class MLAnalyzer:
             topic_changes=np.random.randint(0, 5)
         )
 
-    def analyze_repository_data(self, current_data: Dict) -> Dict[str, Any]:
+    @staticmethod
+    def _create_synthetic_company_data(repo_data: Dict, contributors_count: int = 0) -> Dict:
+        """Create synthetic company data for demonstration"""
+        return {
+            'name': repo_data.get('name'),
+            'stars': repo_data.get('stars', 0),
+            'forks': repo_data.get('forks', 0),
+            'contributors_count': contributors_count,
+            'commit_frequency': np.random.exponential(2),  # Synthetic
+            'company_age_years': np.random.uniform(1, 10),  # Synthetic
+            'big_tech_contributors': np.random.randint(0, 20),  # Synthetic
+            'funding_rounds': np.random.randint(0, 5),  # Synthetic
+            'industry': 'Technology',
+            'tech_stack': [repo_data['language']] if isinstance(repo_data.get('language'), str) else []
+        }
+
+    def analyze_repository_data(self, current_data: Dict,
+                                history: Optional['RepositoryHistory'] = None) -> Dict[str, Any]:
         """Perform complete ML analysis on repository data"""
         results = {
             'anomalies': [],
@@ -507,18 +739,28 @@ class MLAnalyzer:
             logger.warning("No repository data found for analysis")
             return results
 
-        # Extract features for all repositories
-        current_features = []
-        for repo in current_data['repositories'][:20]:  # Limit for processing
-            contributors = current_data.get('contributor_patterns', {}).get(repo['full_name'], [])
-            historical_repo_data = []  # Would load from database in real implementation
+        # Snapshot history of every analyzed repository, looked up in one pass
+        repositories = current_data['repositories']
+        if history is None:
+            from github_history import RepositoryHistory
+            history = RepositoryHistory.load(HISTORY_WINDOW_DAYS)
+        since = (datetime.now() - timedelta(days=HISTORY_WINDOW_DAYS)).isoformat()
+
+        # Extract features for all repositories in one batch
+        repos_df = pd.DataFrame(repositories, columns=['id', 'full_name', 'stars', 'forks', 'watchers'])
+        contributors_df = pd.DataFrame(
+            [(name, c.get('company')) for name, contributors in current_data.get('contributor_patterns', {}).items()
+             for c in contributors],
+            columns=['repository', 'company']
+        )
+        history_df = history.to_frame(repos_df['full_name'], start=since)
 
-            features = self.feature_engineer.create_feature_vector(repo, contributors, historical_repo_data)
-            current_features.append(features)
+        matrix = self.feature_engineer.build_feature_matrix(repos_df, contributors_df, history_df)
+        repo_ids = repos_df['id'].fillna(0).astype(int).tolist()
 
         # Detect anomalies
         if self.anomaly_detector.is_trained:
-            anomalies = self.anomaly_detector.detect_anomalies(current_features)
+            anomalies = self.anomaly_detector.detect_anomalies_matrix(repo_ids, matrix)
             results['anomalies'] = [vars(a) for a in anomalies]
 
             # Risk assessment
@@ -529,23 +771,18 @@ class MLAnalyzer:
                 'overall_risk_level': 'HIGH' if len(high_risk_anomalies) > 3 else 'MEDIUM' if len(high_risk_anomalies) > 1 else 'LOW'
             }
 
+        # Fold this cycle's features into the incremental window, after scoring them
+        if self.incremental and len(matrix):
+            self.anomaly_detector.partial_fit(matrix)
+            self.model_store.save(ANOMALY_WINDOW_MODEL, ANOMALY_WINDOW_MODEL, self.anomaly_detector.to_artifact())
+
         # Predict acquisitions
         if self.acquisition_predictor.is_trained:
             predictions = []
             for repo in current_data['repositories'][:10]:
                 # Create company data for prediction
-                company_data = {
-                    'name': repo['name'],
-                    'stars': repo['stars'],
-                    'forks': repo['forks'],
-                    'contributors_count': len(current_data.get('contributor_patterns', {}).get(repo['full_name'], [])),
-                    'commit_frequency': np.random.exponential(2),  # Synthetic
-                    'company_age_years': np.random.uniform(1, 10),  # Synthetic
-                    'big_tech_contributors': np.random.randint(0, 20),  # Synthetic
-                    'funding_rounds': np.random.randint(0, 5),  # Synthetic
-                    'industry': 'Technology',
-                    'tech_stack': [repo['language']] if repo['language'] else []
-                }
+                contributors_count = len(current_data.get('contributor_patterns', {}).get(repo['full_name'], []))
+                company_data = self._create_synthetic_company_data(repo, contributors_count)
 
                 prediction = self.acquisition_predictor.predict_acquisition_probability(company_data)
                 predictions.append(vars(prediction))
@@ -566,16 +803,13 @@ def main():
 
     # Load current data for analysis
     try:
-        # Find most recent data file
-        data_files = [f for f in os.listdir('data') if f.endswith('.json')]
-        if not data_files:
+        # Find most recent collection run
+        from github_snapshots import load_latest_collection
+        current_data = load_latest_collection('data', ANALYSIS_COLUMNS)
+        if current_data is None:
             logger.error("No data files found for analysis")
             return
 
-        latest_file = max(data_files, key=lambda x: os.path.getctime(os.path.join('data', x)))
-        with open(os.path.join('data', latest_file), 'r') as f:
-            current_data = json.load(f)
-
         # Perform analysis
         results = analyzer.analyze_repository_data(current_data)
 
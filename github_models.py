@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+GitHub M&A Intelligence Model Store
+Versioned on-disk model artifacts, reused until their training data changes
+"""
+
+import os
+import glob
+import hashlib
+import logging
+from datetime import datetime
+from typing import Dict, List, Optional
+import joblib
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Bump when the artifact layout changes; older artifacts are then ignored
+MODEL_FORMAT_VERSION = 1
+
+def data_fingerprint(df: pd.DataFrame) -> str:
+    """Order-independent hash of a training data frame's contents"""
+    rows = pd.util.hash_pandas_object(df, index=False).to_numpy()
+    digest = hashlib.sha256(str(list(df.columns)).encode())
+    digest.update(rows[rows.argsort()].tobytes())
+    return digest.hexdigest()
+
+class ModelStore:
+    """joblib artifacts of fitted models named <model>-v<format>-<fingerprint>.joblib
+
+    An artifact holds the fitted scaler and estimator together with the
+    feature columns they were fitted on. Artifacts are written uncompressed
+    so that their arrays are memory-mapped on load and shared through the
+    page cache by every process serving the same model.
+    """
+
+    def __init__(self, model_dir: str = 'data/models', keep: int = 3):
+        self.model_dir = model_dir
+        self.keep = keep  # Artifacts kept per model
+
+    @classmethod
+    def from_env(cls) -> 'ModelStore':
+        return cls(model_dir=os.getenv('MODEL_DIR', 'data/models'))
+
+    def path(self, name: str, fingerprint: str) -> str:
+        return os.path.join(self.model_dir, f'{name}-v{MODEL_FORMAT_VERSION}-{fingerprint[:16]}.joblib')
+
+    def load(self, name: str, fingerprint: str, feature_columns: List[str]) -> Optional[Dict]:
+        """The artifact of a model trained on data with this fingerprint, if one was saved"""
+        path = self.path(name, fingerprint)
+        if not os.path.exists(path):
+            return None
+
+        try:
+            artifact = joblib.load(path, mmap_mode='r')
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable model artifact {path}: {e}")
+            return None
+
+        if artifact.get('fingerprint') != fingerprint or list(artifact.get('feature_columns', [])) != list(feature_columns):
+            logger.info(f"Model artifact {path} no longer matches its feature schema")
+            return None
+
+        logger.info(f"Loaded {name} model trained at {artifact['trained_at']} from {path}")
+        return artifact
+
+    def save(self, name: str, fingerprint: str, artifact: Dict) -> str:
+        """Write an artifact atomically and prune the oldest ones of the same model"""
+        os.makedirs(self.model_dir, exist_ok=True)
+        path = self.path(name, fingerprint)
+
+        artifact = {
+            **artifact,
+            'name': name,
+            'format_version': MODEL_FORMAT_VERSION,
+            'fingerprint': fingerprint,
+            'trained_at': datetime.now().isoformat()
+        }
+
+        tmp_path = f'{path}.{os.getpid()}.tmp'
+        joblib.dump(artifact, tmp_path)
+        os.replace(tmp_path, path)
+
+        artifacts = sorted(glob.glob(os.path.join(self.model_dir, f'{name}-v*.joblib')), key=os.path.getmtime)
+        for old_path in artifacts[:-self.keep]:
+            os.remove(old_path)
+
+        logger.info(f"Saved {name} model to {path}")
+        return path
@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+GitHub M&A Intelligence Neural Models
+Registry of optional deep learning models; TensorFlow is imported only when one is built
+"""
+
+import logging
+from typing import Any, Callable, Dict, List
+
+logger = logging.getLogger(__name__)
+
+NEURAL_MODELS: Dict[str, Callable[..., Any]] = {}
+
+def register_neural_model(name: str):
+    """Register a model factory under a name; the factory imports its framework itself"""
+    def decorator(factory: Callable[..., Any]) -> Callable[..., Any]:
+        NEURAL_MODELS[name] = factory
+        return factory
+    return decorator
+
+def available_neural_models() -> List[str]:
+    return sorted(NEURAL_MODELS)
+
+def create_neural_model(name: str, **kwargs) -> Any:
+    """Build a registered neural model"""
+    if name not in NEURAL_MODELS:
+        raise ValueError(f"Unknown neural model {name!r}; available: {', '.join(available_neural_models())}")
+
+    logger.info(f"Building neural model {name}")
+    return NEURAL_MODELS[name](**kwargs)
+
+@register_neural_model('autoencoder')
+def build_autoencoder(input_dim: int, encoding_dim: int = 4):
+    """Dense autoencoder over `input_dim` features; its reconstruction error scores anomalies"""
+    from tensorflow import keras
+    from tensorflow.keras import layers
+
+    inputs = keras.Input(shape=(input_dim,))
+    encoded = layers.Dense(8, activation='relu')(inputs)
+    encoded = layers.Dense(encoding_dim, activation='relu')(encoded)
+    decoded = layers.Dense(8, activation='relu')(encoded)
+    outputs = layers.Dense(input_dim)(decoded)
+
+    model = keras.Model(inputs, outputs, name='feature_autoencoder')
+    model.compile(optimizer='adam', loss='mse')
+    return model
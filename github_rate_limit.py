@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+GitHub M&A Intelligence Rate Limiting
+Adaptive request pacing driven by GitHub's rate limit response headers
+"""
+
+import time
+import logging
+import threading
+from typing import Dict, Mapping, Optional
+
+logger = logging.getLogger(__name__)
+
+class RateLimitGovernor:
+    """Thread-safe token bucket refilled from X-RateLimit-* headers
+
+    The bucket holds the calls left in the current rate limit window. Requests
+    flow freely while it holds more than `reserve` tokens; below that the
+    remaining tokens are spread evenly until the window resets. Secondary
+    rate limits (Retry-After) block every caller until they expire.
+    """
+
+    def __init__(self, limit: int = 5000, window_seconds: float = 3600, reserve: int = 500):
+        self.limit = limit
+        self.window_seconds = window_seconds
+        self.reserve = reserve
+
+        self.remaining = limit
+        self.reset_at = time.time() + window_seconds
+        self.blocked_until = 0.0
+        self.throttled_requests = 0
+        self.throttle_seconds = 0.0
+
+        self._next_slot = 0.0
+        self._lock = threading.Lock()
+
+    def reserve_slot(self) -> float:
+        """Claim a request slot and return how many seconds to wait before using it"""
+        with self._lock:
+            now = time.time()
+            if now >= self.reset_at:
+                # New window; the next response headers will confirm the real quota
+                self.remaining = self.limit
+                self.reset_at = now + self.window_seconds
+
+            start = max(now, self.blocked_until)
+            if self.remaining <= 0:
+                start = max(start, self.reset_at)
+            elif self.remaining <= self.reserve:
+                start = max(start, self._next_slot)
+                self._next_slot = start + max(self.reset_at - start, 0) / self.remaining
+
+            self.remaining -= 1
+
+            delay = start - now
+            if delay > 0:
+                self.throttled_requests += 1
+                self.throttle_seconds += delay
+            return delay
+
+    def acquire(self):
+        """Block the calling thread until it may send a request"""
+        delay = self.reserve_slot()
+        if delay > 0:
+            time.sleep(delay)
+
+    def update(self, headers: Mapping[str, str], status_code: Optional[int] = None):
+        """Refill the bucket from a response's rate limit headers"""
+        with self._lock:
+            if 'X-RateLimit-Limit' in headers:
+                self.limit = int(headers['X-RateLimit-Limit'])
+            if 'X-RateLimit-Remaining' in headers:
+                self.remaining = int(headers['X-RateLimit-Remaining'])
+            if 'X-RateLimit-Reset' in headers:
+                self.reset_at = float(headers['X-RateLimit-Reset'])
+
+            # Secondary rate limits tell us how long to back off
+            if 'Retry-After' in headers:
+                retry_after = float(headers['Retry-After'])
+                self.blocked_until = max(self.blocked_until, time.time() + retry_after)
+                logger.warning(f"GitHub asked to retry after {retry_after:.0f}s")
+            elif status_code in (403, 429) and self.remaining <= 0:
+                self.blocked_until = max(self.blocked_until, self.reset_at)
+                logger.warning("GitHub rate limit exhausted, pausing until reset")
+
+    def stats(self) -> Dict[str, float]:
+        """Current quota and time spent throttling"""
+        with self._lock:
+            return {
+                'rate_limit_remaining': self.remaining,
+                'rate_limit_reset_in': max(self.reset_at - time.time(), 0.0),
+                'throttled_requests': self.throttled_requests,
+                'throttle_seconds': self.throttle_seconds
+            }
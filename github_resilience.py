@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+GitHub M&A Intelligence Resilience
+Jittered exponential retries and per-host circuit breakers for GitHub API calls
+"""
+
+import os
+import time
+import random
+import logging
+import threading
+from urllib.parse import urlparse
+from typing import Dict, Mapping, Optional
+
+logger = logging.getLogger(__name__)
+
+class CircuitOpenError(Exception):
+    """Raised instead of sending a request to a host whose circuit is open"""
+
+class RetryPolicy:
+    """Decides whether and when to retry transient GitHub API failures"""
+
+    def __init__(self, max_retries: int = 3, base_delay: float = 1.0, max_delay: float = 60.0):
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+        self.retries = 0
+        self.retry_seconds = 0.0
+        self.exhausted = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> 'RetryPolicy':
+        return cls(
+            max_retries=int(os.getenv('GITHUB_MAX_RETRIES', 3)),
+            base_delay=float(os.getenv('GITHUB_RETRY_BASE_DELAY', 1.0)),
+            max_delay=float(os.getenv('GITHUB_RETRY_MAX_DELAY', 60.0))
+        )
+
+    @staticmethod
+    def is_transient(status_code: Optional[int], headers: Optional[Mapping[str, str]] = None) -> bool:
+        """Connection errors, timeouts (no status), 5xx, 429 and secondary rate limit 403s"""
+        if status_code is None or status_code >= 500 or status_code == 429:
+            return True
+        return status_code == 403 and headers is not None and 'Retry-After' in headers
+
+    def retry_delay(self, attempt: int, status_code: Optional[int] = None,
+                    headers: Optional[Mapping[str, str]] = None) -> Optional[float]:
+        """Seconds to wait before retrying after failed attempt number `attempt`, or None to give up"""
+        if not self.is_transient(status_code, headers):
+            return None
+
+        with self._lock:
+            if attempt >= self.max_retries:
+                self.exhausted += 1
+                return None
+
+            # Full jitter keeps concurrent workers from retrying in lockstep
+            delay = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+            if headers is not None and 'Retry-After' in headers:
+                delay = max(delay, float(headers['Retry-After']))
+
+            self.retries += 1
+            self.retry_seconds += delay
+            return delay
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            return {
+                'retries': self.retries,
+                'retry_seconds': self.retry_seconds,
+                'retries_exhausted': self.exhausted
+            }
+
+class CircuitBreaker:
+    """Fails fast after consecutive failures, then lets a single probe through once recovered"""
+
+    def __init__(self, failure_threshold: int = 5, recovery_timeout: float = 60.0):
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+
+        self.state = 'closed'
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self.times_opened = 0
+        self.rejected = 0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """Whether a request may be sent now"""
+        with self._lock:
+            if self.state == 'open' and time.time() - self.opened_at >= self.recovery_timeout:
+                self.state = 'half_open'
+                self._probing = False
+
+            if self.state == 'closed':
+                return True
+            if self.state == 'half_open' and not self._probing:
+                self._probing = True
+                return True
+
+            self.rejected += 1
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.state = 'closed'
+            self.consecutive_failures = 0
+            self._probing = False
+
+    def record_failure(self):
+        with self._lock:
+            self.consecutive_failures += 1
+            if self.state == 'half_open' or self.consecutive_failures >= self.failure_threshold:
+                if self.state != 'open':
+                    self.times_opened += 1
+                self.state = 'open'
+                self.opened_at = time.time()
+                self._probing = False
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                'state': self.state,
+                'consecutive_failures': self.consecutive_failures,
+                'times_opened': self.times_opened,
+                'rejected_requests': self.rejected
+            }
+
+class HostCircuitBreakers:
+    """One circuit breaker per API host"""
+
+    def __init__(self, failure_threshold: int = 5, recovery_timeout: float = 60.0):
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self._breakers = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> 'HostCircuitBreakers':
+        return cls(
+            failure_threshold=int(os.getenv('GITHUB_BREAKER_FAILURE_THRESHOLD', 5)),
+            recovery_timeout=float(os.getenv('GITHUB_BREAKER_RECOVERY_SECONDS', 60))
+        )
+
+    def for_url(self, url: str) -> CircuitBreaker:
+        host = urlparse(url).netloc
+        with self._lock:
+            breaker = self._breakers.get(host)
+            if breaker is None:
+                breaker = self._breakers[host] = CircuitBreaker(self.failure_threshold, self.recovery_timeout)
+            return breaker
+
+    def record(self, url: str, status_code: Optional[int]):
+        """Count a response (or a failure to get one) against its host"""
+        breaker = self.for_url(url)
+        # Rate limiting means the host is up; only errors and timeouts indicate degradation
+        if status_code is None or status_code >= 500:
+            was_open = breaker.state == 'open'
+            breaker.record_failure()
+            if breaker.state == 'open' and not was_open:
+                logger.warning(f"Circuit opened for {urlparse(url).netloc} after "
+                               f"{breaker.consecutive_failures} consecutive failures")
+        else:
+            breaker.record_success()
+
+    def stats(self) -> Dict[str, Dict]:
+        with self._lock:
+            breakers = dict(self._breakers)
+        return {host: breaker.stats() for host, breaker in breakers.items()}
@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+"""
+GitHub M&A Intelligence Snapshots
+Columnar Parquet snapshots of collection runs, partitioned by entity and date
+"""
+
+import os
+import json
+import glob
+import typing
+import logging
+from functools import lru_cache
+from importlib.util import find_spec
+from dataclasses import fields
+from datetime import datetime
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Sequence, Tuple
+import pandas as pd
+from github_data_collector import RepositoryData, ContributorData, CommitData, TransferEvent
+
+logger = logging.getLogger(__name__)
+
+# orjson parses collection files several times faster when it is installed
+if find_spec('orjson'):
+    from orjson import loads as _json_loads
+else:
+    _json_loads = json.loads
+
+# Collection runs written as JSON, by whichever entry point produced them
+COLLECTION_FILE_PATTERNS = ('*_collected_data.json', '*_github_ma_intelligence.json', '*_api_data.json')
+
+# Entity partitions, the dataclass each one's columns follow and the column
+# tying rows back to their repository or organization
+SNAPSHOT_ENTITIES = {
+    'repositories': (RepositoryData, None),
+    'contributors': (ContributorData, 'repository'),
+    'commits': (CommitData, 'repository'),
+    'transfers': (TransferEvent, None),
+    'events': (None, 'org')
+}
+
+# Columns of compact organization events (see github_events.compact_event)
+EVENT_COLUMNS = (
+    ('id', str), ('type', str), ('org', str), ('actor', str), ('repo', str), ('created_at', str),
+    ('action', str), ('ref', str), ('ref_type', str), ('size', int), ('forkee', str), ('member', str)
+)
+
+@lru_cache(maxsize=None)
+def snapshot_schema(entity: str):
+    """Arrow schema of an entity partition, derived from its dataclass"""
+    import pyarrow as pa
+
+    arrow_types = {int: pa.int64(), str: pa.string(), float: pa.float64(), bool: pa.bool_()}
+
+    def arrow_type(hint):
+        # Optional[X] is nullable X; every column is nullable anyway
+        args = [arg for arg in typing.get_args(hint) if arg is not type(None)]
+        if typing.get_origin(hint) is typing.Union:
+            return arrow_type(args[0])
+        if typing.get_origin(hint) is list:
+            return pa.list_(arrow_type(args[0]))
+        return arrow_types[hint]
+
+    cls, key = SNAPSHOT_ENTITIES[entity]
+    if cls is None:
+        columns = [(name, arrow_types[hint]) for name, hint in EVENT_COLUMNS]
+    else:
+        hints = typing.get_type_hints(cls)
+        columns = [(field.name, arrow_type(hints[field.name])) for field in fields(cls)]
+
+    if key and key not in dict(columns):
+        columns.insert(0, (key, pa.string()))
+    return pa.schema(columns + [('collected_at', pa.string())])
+
+class SnapshotStore:
+    """Parquet dataset of collection runs laid out as <root>/entity=<entity>/snapshot_date=<YYYY-MM-DD>/<run>.parquet"""
+
+    def __init__(self, root: str = 'data/snapshots', compression: str = 'zstd'):
+        self.root = root
+        self.compression = compression
+
+    @classmethod
+    def from_env(cls) -> 'SnapshotStore':
+        return cls(
+            root=os.getenv('SNAPSHOT_DIR', 'data/snapshots'),
+            compression=os.getenv('SNAPSHOT_COMPRESSION', 'zstd')
+        )
+
+    @staticmethod
+    def available() -> bool:
+        """Whether pyarrow is installed"""
+        return find_spec('pyarrow') is not None
+
+    def write(self, data: Dict) -> str:
+        """Write one collection run, one file per entity, and return its run id"""
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        collected_at = data.get('timestamp') or datetime.now().isoformat()
+        run_id = datetime.fromisoformat(collected_at).strftime('%Y%m%dT%H%M%S')
+
+        for entity, rows in self._entity_rows(data).items():
+            for row in rows:
+                row['collected_at'] = collected_at
+
+            table = pa.Table.from_pylist(rows, schema=snapshot_schema(entity))
+            path = self._run_path(entity, run_id)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+
+            # Dot-prefixed temporary files are ignored by dataset readers
+            tmp_path = os.path.join(os.path.dirname(path), f'.{run_id}.parquet.tmp')
+            pq.write_table(table, tmp_path, compression=self.compression)
+            os.replace(tmp_path, path)
+
+        logger.info(f"Snapshot {run_id} written to {self.root}")
+        return run_id
+
+    def runs(self) -> List[str]:
+        """Run ids in chronological order"""
+        paths = glob.glob(os.path.join(self.root, 'entity=repositories', 'snapshot_date=*', '*.parquet'))
+        return sorted(os.path.basename(path)[:-len('.parquet')] for path in paths)
+
+    def read(self, entity: str, columns: Optional[Sequence[str]] = None,
+             since: Optional[str] = None, until: Optional[str] = None):
+        """Read an entity across runs as a DataFrame, touching only the requested columns and dates"""
+        import pyarrow as pa
+        import pyarrow.dataset as ds
+
+        path = os.path.join(self.root, f'entity={entity}')
+        if not os.path.exists(path):
+            return snapshot_schema(entity).empty_table().to_pandas()
+
+        partition = pa.field('snapshot_date', pa.string())
+        dataset = ds.dataset(path, format='parquet', schema=snapshot_schema(entity).append(partition),
+                             partitioning=ds.partitioning(pa.schema([partition]), flavor='hive'))
+
+        # Dates are compared as partition values, so days outside the range are never opened
+        condition = None
+        if since:
+            condition = ds.field('snapshot_date') >= since[:10]
+        if until:
+            before = ds.field('snapshot_date') <= until[:10]
+            condition = before if condition is None else condition & before
+
+        return dataset.to_table(columns=list(columns) if columns else None, filter=condition).to_pandas()
+
+    def read_run(self, run_id: str, columns: Optional[Dict[str, Sequence[str]]] = None) -> Dict:
+        """Rebuild a run as a collection dict, reading only the entities and columns in `columns`"""
+        import pyarrow.parquet as pq
+
+        entities = columns or {entity: None for entity in SNAPSHOT_ENTITIES}
+        tables = {}
+        for entity, entity_columns in entities.items():
+            key = SNAPSHOT_ENTITIES[entity][1]
+            if entity_columns is not None and key and key not in entity_columns:
+                entity_columns = [key, *entity_columns]
+            path = self._run_path(entity, run_id)
+            tables[entity] = pq.read_table(path, columns=entity_columns).to_pylist() if os.path.exists(path) else []
+
+        for rows in tables.values():
+            for row in rows:
+                row.pop('collected_at', None)
+
+        data = {'timestamp': datetime.strptime(run_id, '%Y%m%dT%H%M%S').isoformat()}
+        if 'repositories' in tables:
+            data['repositories'] = tables['repositories']
+        if 'contributors' in tables:
+            data['contributor_patterns'] = _group(tables['contributors'], 'repository')
+        if 'commits' in tables:
+            data['commit_activity'] = _group(tables['commits'], 'repository')
+        if 'transfers' in tables:
+            data['transfer_events'] = tables['transfers']
+        if 'events' in tables:
+            # Compact events leave out payload fields their type doesn't have
+            events = [{k: v for k, v in event.items() if v is not None} for event in tables['events']]
+            data['organization_activities'] = _group(events, 'org', keep_key=True)
+        return data
+
+    def _run_path(self, entity: str, run_id: str) -> str:
+        date = datetime.strptime(run_id, '%Y%m%dT%H%M%S').strftime('%Y-%m-%d')
+        return os.path.join(self.root, f'entity={entity}', f'snapshot_date={date}', f'{run_id}.parquet')
+
+    @staticmethod
+    def _entity_rows(data: Dict) -> Dict[str, List[Dict]]:
+        def tagged(groups: Dict[str, List[Dict]], key: str) -> List[Dict]:
+            return [{**row, key: name} for name, rows in (groups or {}).items() for row in rows]
+
+        return {
+            'repositories': [dict(repo) for repo in data.get('repositories', [])],
+            'contributors': tagged(data.get('contributor_patterns'), 'repository'),
+            'commits': tagged(data.get('commit_activity'), 'repository'),
+            'transfers': [dict(event) for event in data.get('transfer_events', [])],
+            'events': tagged(data.get('organization_activities'), 'org')
+        }
+
+def _group(rows: List[Dict], key: str, keep_key: bool = False) -> Dict[str, List[Dict]]:
+    groups = defaultdict(list)
+    for row in rows:
+        name = row[key] if keep_key else row.pop(key)
+        groups[name].append(row)
+    return dict(groups)
+
+def save_collection_snapshot(data: Dict, name: str, data_dir: str = 'data') -> str:
+    """Write a collection run as a Parquet snapshot, or as compact JSON when pyarrow is missing"""
+    if SnapshotStore.available():
+        store = SnapshotStore.from_env()
+        return f'{store.root} (run {store.write(data)})'
+
+    os.makedirs(data_dir, exist_ok=True)
+    filepath = os.path.join(data_dir, f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{name}.json")
+    with open(filepath, 'w') as f:
+        json.dump(data, f, separators=(',', ':'), default=str)
+    return filepath
+
+def load_latest_collection(data_dir: str = 'data',
+                           columns: Optional[Dict[str, Sequence[str]]] = None) -> Optional[Dict]:
+    """The most recent collection run, from the snapshot store or else the newest JSON file"""
+    if SnapshotStore.available():
+        store = SnapshotStore.from_env()
+        runs = store.runs()
+        if runs:
+            return store.read_run(runs[-1], columns)
+
+    paths = collection_files(data_dir)
+    if not paths:
+        return None
+
+    with open(max(paths, key=os.path.getmtime), 'r') as f:
+        return json.load(f)
+
+def collection_files(data_dir: str = 'data') -> List[str]:
+    """Collection run JSON files in a directory, leaving out analysis results and other outputs"""
+    return sorted(path for pattern in COLLECTION_FILE_PATTERNS for path in glob.glob(os.path.join(data_dir, pattern)))
+
+def _parse_repositories(path: str, columns: Sequence[str]) -> List[tuple]:
+    """Repository rows of one collection file, reduced to `columns`"""
+    with open(path, 'rb') as f:
+        data = _json_loads(f.read())
+    # As in the snapshot store, collected_at is the run's timestamp
+    return [tuple(data.get('timestamp') if column == 'collected_at' else repo.get(column) for column in columns)
+            for repo in data.get('repositories', ())]
+
+def _parse_repository_files(paths: List[str], columns: Sequence[str]) -> List[Tuple[str, List[tuple]]]:
+    parsed = []
+    for path in paths:
+        try:
+            parsed.append((path, _parse_repositories(path, columns)))
+        except Exception as e:
+            logger.error(f"Error loading {path}: {e}")
+    return parsed
+
+def load_collection_history(data_dir: str = 'data', columns: Sequence[str] = ('id', 'stars'),
+                            cache_path: Optional[str] = None, max_workers: Optional[int] = None) -> pd.DataFrame:
+    """Repository rows of every collection JSON file, parsing only files that changed since the last call
+
+    Parsed rows are cached per file, keyed by mtime and size, in a manifest
+    next to the data. New or modified files are parsed in a process pool,
+    in batches, and only the requested columns of each record are kept.
+    """
+    columns = list(columns)
+    cache_path = cache_path or os.path.join(data_dir, 'cache', 'collection_files.pkl')
+
+    manifest = {}
+    if os.path.exists(cache_path):
+        try:
+            cached = pd.read_pickle(cache_path)
+            if cached.get('columns') == columns:
+                manifest = cached['files']
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable collection file cache {cache_path}: {e}")
+
+    files, changed = {}, []
+    for path in collection_files(data_dir):
+        stat = os.stat(path)
+        key = (stat.st_mtime_ns, stat.st_size)
+        entry = manifest.get(path)
+        if entry is not None and entry[0] == key:
+            files[path] = entry
+        else:
+            files[path] = (key, None)
+            changed.append(path)
+
+    reused = len(files) - len(changed)
+    if changed:
+        batches = [changed[i:i + 256] for i in range(0, len(changed), 256)]
+        workers = max_workers or min(os.cpu_count() or 1, len(batches))
+        if workers > 1:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                results = [item for batch in executor.map(_parse_repository_files, batches, [columns] * len(batches))
+                           for item in batch]
+        else:
+            results = _parse_repository_files(changed, columns)
+
+        for path, rows in results:
+            files[path] = (files[path][0], rows)
+        files = {path: entry for path, entry in files.items() if entry[1] is not None}
+
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        tmp_path = f'{cache_path}.{os.getpid()}.tmp'
+        pd.to_pickle({'columns': columns, 'files': files}, tmp_path)
+        os.replace(tmp_path, cache_path)
+
+    logger.info(f"Loaded {len(files)} collection files ({len(files) - reused} parsed, {reused} cached)")
+    return pd.DataFrame([row for _, rows in files.values() for row in rows], columns=columns)
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+GitHub M&A Intelligence Collection State
+Persisted high-water marks that let each collection run fetch only what changed
+"""
+
+import os
+import json
+import logging
+import threading
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+class CollectionState:
+    """Per-repository and per-organization high-water marks stored as JSON"""
+
+    def __init__(self, path: Optional[str] = 'data/collection_state.json'):
+        self.path = path  # None keeps the marks in memory only
+        self._lock = threading.Lock()
+        self._state = {'repositories': {}, 'organizations': {}}
+
+        if path and os.path.exists(path):
+            try:
+                with open(path, 'r') as f:
+                    self._state.update(json.load(f))
+            except (OSError, ValueError) as e:
+                logger.error(f"Ignoring unreadable collection state {path}: {e}")
+
+    def _repo(self, full_name: str) -> Dict:
+        return self._state['repositories'].setdefault(full_name, {'pushed_at': {}})
+
+    def _org(self, org: str) -> Dict:
+        return self._state['organizations'].setdefault(org, {})
+
+    def is_current(self, full_name: str, aspect: str, pushed_at: Optional[str]) -> bool:
+        """Whether `aspect` of a repository was collected at its current pushed_at"""
+        with self._lock:
+            repo = self._state['repositories'].get(full_name)
+            return bool(pushed_at) and repo is not None and repo['pushed_at'].get(aspect) == pushed_at
+
+    def mark_current(self, full_name: str, aspect: str, pushed_at: Optional[str]):
+        """Record that `aspect` of a repository was collected at pushed_at"""
+        with self._lock:
+            self._repo(full_name)['pushed_at'][aspect] = pushed_at
+
+    def get_contributors(self, full_name: str) -> List[Dict]:
+        """Contributors recorded by the last run that collected them"""
+        with self._lock:
+            return self._state['repositories'].get(full_name, {}).get('contributors', [])
+
+    def set_contributors(self, full_name: str, contributors: List[Dict]):
+        with self._lock:
+            self._repo(full_name)['contributors'] = contributors
+
+    def get_details_fetched_at(self, full_name: str) -> Optional[float]:
+        """Unix time of the last repository details call"""
+        with self._lock:
+            return self._state['repositories'].get(full_name, {}).get('details_fetched_at')
+
+    def set_details_fetched_at(self, full_name: str, fetched_at: float):
+        with self._lock:
+            self._repo(full_name)['details_fetched_at'] = fetched_at
+
+    def get_last_commit_date(self, full_name: str) -> Optional[str]:
+        with self._lock:
+            return self._state['repositories'].get(full_name, {}).get('last_commit_date')
+
+    def get_last_commit_shas(self, full_name: str) -> List[str]:
+        """SHAs of the collected commits dated exactly at the last commit date"""
+        with self._lock:
+            return self._state['repositories'].get(full_name, {}).get('last_commit_shas', [])
+
+    def set_last_commit(self, full_name: str, date: str, shas: List[str]):
+        """Advance the commit high-water mark to `date`, remembering the SHAs collected at it"""
+        with self._lock:
+            repo = self._repo(full_name)
+            last_date = repo.get('last_commit_date')
+            if last_date and last_date > date:
+                return
+            if last_date == date:
+                shas = set(shas) | set(repo.get('last_commit_shas', []))
+            repo['last_commit_date'] = date
+            repo['last_commit_shas'] = sorted(shas)
+
+    def get_last_event_id(self, org: str) -> Optional[int]:
+        with self._lock:
+            return self._state['organizations'].get(org, {}).get('last_event_id')
+
+    def set_last_event_id(self, org: str, event_id: int):
+        with self._lock:
+            entry = self._org(org)
+            entry['last_event_id'] = max(event_id, entry.get('last_event_id') or event_id)
+
+    def get_poll_schedule(self, org: str) -> Dict:
+        """Adaptive polling state of an organization's event feed"""
+        with self._lock:
+            entry = self._state['organizations'].get(org, {})
+            return {key: entry.get(key) for key in ('next_poll_at', 'last_polled_at', 'event_rate')}
+
+    def set_poll_schedule(self, org: str, next_poll_at: float, last_polled_at: float, event_rate: float):
+        with self._lock:
+            self._org(org).update(next_poll_at=next_poll_at, last_polled_at=last_polled_at, event_rate=event_rate)
+
+    def reset(self):
+        """Forget all high-water marks so the next run collects everything"""
+        with self._lock:
+            self._state = {'repositories': {}, 'organizations': {}}
+
+    def save(self):
+        """Atomically write the state file"""
+        if not self.path:
+            return
+        with self._lock:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            tmp_path = f'{self.path}.tmp'
+            with open(tmp_path, 'w') as f:
+                json.dump(self._state, f, default=str)
+            os.replace(tmp_path, self.path)
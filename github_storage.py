@@ -0,0 +1,425 @@
+#!/usr/bin/env python3
+"""
+GitHub M&A Intelligence Storage
+Bulk upserts of collection runs into the PostgreSQL or SQLite schema
+"""
+
+import os
+import io
+import csv
+import json
+import sqlite3
+import logging
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# SQLite has no UUIDs, arrays, JSONB or triggers; this mirrors the columns of
+# database_schema.sql that collection runs write
+SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS repositories (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    full_name TEXT NOT NULL UNIQUE,
+    owner TEXT NOT NULL,
+    owner_type TEXT,
+    description TEXT,
+    language TEXT,
+    stars INTEGER DEFAULT 0,
+    forks INTEGER DEFAULT 0,
+    watchers INTEGER DEFAULT 0,
+    size INTEGER DEFAULT 0,
+    created_at TEXT,
+    updated_at TEXT,
+    pushed_at TEXT,
+    archived BOOLEAN DEFAULT 0,
+    disabled BOOLEAN DEFAULT 0,
+    visibility TEXT DEFAULT 'public',
+    topics TEXT,
+    license_name TEXT,
+    created_at_db TEXT DEFAULT CURRENT_TIMESTAMP,
+    updated_at_db TEXT DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS repository_snapshots (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    repository_id INTEGER REFERENCES repositories(id) ON DELETE CASCADE,
+    snapshot_date TEXT DEFAULT CURRENT_TIMESTAMP,
+    stars INTEGER,
+    forks INTEGER,
+    watchers INTEGER,
+    size INTEGER,
+    contributor_count INTEGER,
+    metadata TEXT
+);
+
+CREATE TABLE IF NOT EXISTS contributors (
+    id INTEGER PRIMARY KEY,
+    login TEXT NOT NULL UNIQUE,
+    company TEXT,
+    location TEXT,
+    public_repos INTEGER DEFAULT 0,
+    followers INTEGER DEFAULT 0,
+    following INTEGER DEFAULT 0,
+    hireable BOOLEAN,
+    created_at TEXT,
+    created_at_db TEXT DEFAULT CURRENT_TIMESTAMP,
+    updated_at_db TEXT DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS repository_contributors (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    repository_id INTEGER REFERENCES repositories(id) ON DELETE CASCADE,
+    contributor_id INTEGER REFERENCES contributors(id) ON DELETE CASCADE,
+    contributions INTEGER DEFAULT 0,
+    created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+    updated_at TEXT DEFAULT CURRENT_TIMESTAMP,
+    UNIQUE(repository_id, contributor_id)
+);
+
+CREATE TABLE IF NOT EXISTS commits (
+    sha TEXT PRIMARY KEY,
+    repository_id INTEGER REFERENCES repositories(id) ON DELETE CASCADE,
+    author_id INTEGER REFERENCES contributors(id) ON DELETE SET NULL,
+    message TEXT,
+    committed_at TEXT,
+    additions INTEGER DEFAULT 0,
+    deletions INTEGER DEFAULT 0,
+    changed_files INTEGER DEFAULT 0,
+    created_at_db TEXT DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS transfer_events (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    repository_id INTEGER REFERENCES repositories(id) ON DELETE CASCADE,
+    old_owner TEXT,
+    new_owner TEXT,
+    transfer_date TEXT,
+    transfer_type TEXT,
+    confidence_score REAL DEFAULT 0.0,
+    created_at TEXT DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS organization_activities (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    organization TEXT NOT NULL,
+    event_type TEXT NOT NULL,
+    event_id TEXT UNIQUE,
+    actor TEXT,
+    repository TEXT,
+    payload TEXT,
+    created_at TEXT,
+    processed_at TEXT DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS idx_repository_snapshots_repo_date ON repository_snapshots(repository_id, snapshot_date DESC);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_repository_snapshots_run ON repository_snapshots(repository_id, snapshot_date);
+CREATE INDEX IF NOT EXISTS idx_commits_repository ON commits(repository_id);
+CREATE INDEX IF NOT EXISTS idx_organization_activities_org ON organization_activities(organization);
+"""
+
+REPOSITORY_COLUMNS = ('id', 'name', 'full_name', 'owner', 'owner_type', 'description', 'language', 'stars',
+                      'forks', 'watchers', 'size', 'created_at', 'updated_at', 'pushed_at', 'archived',
+                      'disabled', 'visibility', 'topics', 'license_name')
+SNAPSHOT_COLUMNS = ('repository_id', 'snapshot_date', 'stars', 'forks', 'watchers', 'size',
+                    'contributor_count', 'metadata')
+CONTRIBUTOR_COLUMNS = ('id', 'login', 'company', 'location', 'public_repos', 'followers', 'following',
+                       'hireable', 'created_at')
+REPOSITORY_CONTRIBUTOR_COLUMNS = ('repository_id', 'contributor_id', 'contributions')
+COMMIT_COLUMNS = ('sha', 'repository_id', 'author_id', 'message', 'committed_at', 'additions', 'deletions',
+                  'changed_files')
+TRANSFER_COLUMNS = ('repository_id', 'old_owner', 'new_owner', 'transfer_date', 'transfer_type',
+                    'confidence_score')
+ACTIVITY_COLUMNS = ('organization', 'event_type', 'event_id', 'actor', 'repository', 'payload', 'created_at')
+
+# Fields of compact events stored as columns rather than in the payload
+ACTIVITY_EVENT_FIELDS = ('id', 'type', 'org', 'actor', 'repo', 'created_at')
+
+class CollectionRows:
+    """Rows for every table, built from one collection run's snapshot dict"""
+
+    def __init__(self, data: Dict, array_topics: bool):
+        snapshot_date = data.get('timestamp') or datetime.now().isoformat()
+        repositories = data.get('repositories', [])
+        repo_ids = {repo['full_name']: repo['id'] for repo in repositories}
+        contributor_patterns = data.get('contributor_patterns', {})
+
+        self.repositories = [
+            (r['id'], r['name'], r['full_name'], r['owner'], r.get('owner_type'), r.get('description'),
+             r.get('language'), r.get('stars', 0), r.get('forks', 0), r.get('watchers', 0), r.get('size', 0),
+             r.get('created_at') or None, r.get('updated_at') or None, r.get('pushed_at') or None,
+             bool(r.get('archived')), bool(r.get('disabled')), r.get('visibility'),
+             # Postgres takes a TEXT[]; SQLite stores the list as JSON
+             list(r.get('topics') or []) if array_topics else json.dumps(r.get('topics') or []),
+             r.get('license'))
+            for r in repositories
+        ]
+
+        self.snapshots = [
+            (r['id'], snapshot_date, r.get('stars'), r.get('forks'), r.get('watchers'), r.get('size'),
+             len(contributor_patterns[r['full_name']]) if r['full_name'] in contributor_patterns else None,
+             json.dumps({'pushed_at': r.get('pushed_at')}))
+            for r in repositories
+        ]
+
+        # Rows are keyed so one statement never upserts the same row twice, which Postgres rejects.
+        # The contributors table is keyed by GitHub user id; skip entries collected without one
+        contributors = {}
+        repository_contributors = {}
+        for full_name, repo_contributors in contributor_patterns.items():
+            for c in repo_contributors:
+                if c.get('id') is None or full_name not in repo_ids:
+                    continue
+                contributors[c['id']] = (
+                    c['id'], c['username'], c.get('company'), c.get('location'), c.get('public_repos', 0),
+                    c.get('followers', 0), c.get('following', 0), c.get('hireable'), c.get('created_at') or None
+                )
+                repository_contributors[repo_ids[full_name], c['id']] = (
+                    repo_ids[full_name], c['id'], c.get('contributions', 0)
+                )
+        self.contributors = list(contributors.values())
+        self.repository_contributors = list(repository_contributors.values())
+
+        # Forks share commits, so the same SHA can show up under several repositories
+        login_ids = {row[1]: row[0] for row in self.contributors}
+        commits = {}
+        for full_name, repo_commits in data.get('commit_activity', {}).items():
+            if full_name not in repo_ids:
+                continue
+            for c in repo_commits:
+                commits[c['sha']] = (
+                    c['sha'], repo_ids[full_name], login_ids.get(c.get('author')), c.get('message'),
+                    c.get('date') or None, c.get('additions', 0), c.get('deletions', 0), c.get('files_changed', 0)
+                )
+        self.commits = list(commits.values())
+
+        self.transfers = [
+            (t['repo_id'], t.get('old_owner'), t.get('new_owner'), t.get('transfer_date') or None,
+             t.get('transfer_type'), t.get('confidence_score', 0.0))
+            for t in data.get('transfer_events', []) if t.get('repo_id') in repo_ids.values()
+        ]
+
+        self.activities = [
+            (org, e.get('type'), str(e['id']),
+             e['actor'] if isinstance(e.get('actor'), str) else (e.get('actor') or {}).get('login'),
+             e['repo'] if isinstance(e.get('repo'), str) else (e.get('repo') or {}).get('name'),
+             json.dumps({k: v for k, v in e.items() if k not in ACTIVITY_EVENT_FIELDS}),
+             e.get('created_at') or None)
+            for org, events in data.get('organization_activities', {}).items()
+            for e in events
+        ]
+
+    def counts(self) -> Dict[str, int]:
+        return {
+            'repositories': len(self.repositories),
+            'repository_snapshots': len(self.snapshots),
+            'contributors': len(self.contributors),
+            'repository_contributors': len(self.repository_contributors),
+            'commits': len(self.commits),
+            'transfer_events': len(self.transfers),
+            'organization_activities': len(self.activities)
+        }
+
+def _upsert_sql(table: str, columns, conflict: str, placeholder: str, update: bool = True) -> str:
+    """INSERT ... ON CONFLICT statement shared by both backends (SQLite 3.24+ and Postgres)"""
+    key_columns = [c.strip() for c in conflict.split(',')]
+    updates = ', '.join(f'{c} = excluded.{c}' for c in columns if c not in key_columns)
+    action = f'DO UPDATE SET {updates}' if update and updates else 'DO NOTHING'
+    return f'INSERT INTO {table} ({", ".join(columns)}) VALUES {placeholder} ON CONFLICT ({conflict}) {action}'
+
+class CollectionStore:
+    """Writes collection runs to a database; use from_env() to pick the backend from DATABASE_URL"""
+
+    array_topics = False
+
+    @staticmethod
+    def from_env(database_url: Optional[str] = None) -> Optional['CollectionStore']:
+        """Store for DATABASE_URL, or None when no database is configured"""
+        database_url = database_url or os.getenv('DATABASE_URL')
+        if not database_url:
+            return None
+
+        if database_url.startswith('sqlite:///'):
+            return SQLiteStore(database_url.replace('sqlite:///', ''))
+
+        try:
+            import psycopg2
+        except ImportError:
+            logger.warning("psycopg2 not available, collections won't be persisted to the database")
+            return None
+
+        # The pool connects right away; an unreachable database mustn't take the caller down
+        try:
+            return PostgresStore(database_url, max_connections=int(os.getenv('DATABASE_POOL_SIZE', 4)))
+        except psycopg2.OperationalError as e:
+            logger.error(f"Database unavailable, collections won't be persisted to it: {e}")
+            return None
+
+    def save_collection(self, data: Dict) -> Dict[str, int]:
+        """Upsert one collection run in a single transaction; returns rows inserted or updated per table"""
+        rows = CollectionRows(data, self.array_topics)
+        with self.connection() as conn:
+            written = self._write(conn, rows)
+
+        logger.info(f"Persisted collection run: {written} (rows submitted: {rows.counts()})")
+        return written
+
+    def load_snapshots(self, since: Optional[str] = None) -> List[Dict]:
+        """Repository snapshots joined with their repository, oldest first"""
+        query = (
+            'SELECT r.full_name, r.language, r.created_at, s.snapshot_date, s.stars, s.forks, s.watchers, '
+            's.size, s.contributor_count FROM repository_snapshots s '
+            'JOIN repositories r ON r.id = s.repository_id'
+        )
+        params = ()
+        if since:
+            query += f' WHERE s.snapshot_date >= {self.placeholder}'
+            params = (since,)
+        query += ' ORDER BY s.snapshot_date'
+
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(query, params)
+            columns = [d[0] for d in cursor.description]
+            return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+class SQLiteStore(CollectionStore):
+    """SQLite backend: executemany inside one transaction, one connection per thread"""
+
+    placeholder = '?'
+
+    def __init__(self, path: str):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self._local = threading.local()
+
+        with self.connection() as conn:
+            # Databases written before snapshots were unique per run may hold duplicates
+            # that would fail the unique index; keep the first of each
+            has_index = conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'idx_repository_snapshots_run'").fetchone()
+            has_table = conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'repository_snapshots'").fetchone()
+            if has_table and not has_index:
+                conn.execute('DELETE FROM repository_snapshots WHERE id NOT IN '
+                             '(SELECT MIN(id) FROM repository_snapshots GROUP BY repository_id, snapshot_date)')
+            conn.executescript(SQLITE_SCHEMA)
+
+    @contextmanager
+    def connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._local.conn = sqlite3.connect(self.path)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA foreign_keys=ON')
+        with conn:  # Commits on success, rolls back on error
+            yield conn
+
+    def _write(self, conn, rows: CollectionRows) -> Dict[str, int]:
+        values = lambda columns: f'({", ".join("?" * len(columns))})'
+        # executemany's rowcount sums the rows each statement changed; skipped conflicts count zero
+        written = lambda sql, params: conn.executemany(sql, params).rowcount
+        return {
+            'repositories': written(_upsert_sql('repositories', REPOSITORY_COLUMNS, 'id', values(REPOSITORY_COLUMNS)),
+                                    rows.repositories),
+            'repository_snapshots': written(_upsert_sql('repository_snapshots', SNAPSHOT_COLUMNS,
+                                                        'repository_id, snapshot_date', values(SNAPSHOT_COLUMNS),
+                                                        update=False), rows.snapshots),
+            'contributors': written(_upsert_sql('contributors', CONTRIBUTOR_COLUMNS, 'id', values(CONTRIBUTOR_COLUMNS)),
+                                    rows.contributors),
+            'repository_contributors': written(_upsert_sql('repository_contributors', REPOSITORY_CONTRIBUTOR_COLUMNS,
+                                                           'repository_id, contributor_id',
+                                                           values(REPOSITORY_CONTRIBUTOR_COLUMNS)),
+                                               rows.repository_contributors),
+            'commits': written(_upsert_sql('commits', COMMIT_COLUMNS, 'sha', values(COMMIT_COLUMNS)), rows.commits),
+            'transfer_events': written(
+                f'INSERT INTO transfer_events ({", ".join(TRANSFER_COLUMNS)}) SELECT ?, ?, ?, ?, ?, ? '
+                'WHERE NOT EXISTS (SELECT 1 FROM transfer_events WHERE repository_id = ? AND new_owner = ? '
+                'AND transfer_type = ?)',
+                [row + (row[0], row[2], row[4]) for row in rows.transfers]
+            ),
+            'organization_activities': written(_upsert_sql('organization_activities', ACTIVITY_COLUMNS, 'event_id',
+                                                           values(ACTIVITY_COLUMNS), update=False), rows.activities)
+        }
+
+    def close(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+class PostgresStore(CollectionStore):
+    """PostgreSQL backend: execute_values upserts and COPY from a pooled connection"""
+
+    placeholder = '%s'
+    array_topics = True
+
+    def __init__(self, dsn: str, min_connections: int = 1, max_connections: int = 4):
+        from psycopg2.pool import ThreadedConnectionPool
+
+        self.pool = ThreadedConnectionPool(min_connections, max_connections, dsn)
+        # The pool raises instead of blocking when exhausted; cap borrowers to its size
+        self._slots = threading.BoundedSemaphore(max_connections)
+
+    @contextmanager
+    def connection(self):
+        with self._slots:
+            conn = self.pool.getconn()
+            try:
+                with conn:  # Commits on success, rolls back on error
+                    yield conn
+            finally:
+                self.pool.putconn(conn)
+
+    def _write(self, conn, rows: CollectionRows) -> Dict[str, int]:
+        from psycopg2.extras import execute_values
+
+        with conn.cursor() as cursor:
+            def written(sql: str, params: List[tuple], template: Optional[str] = None, page_size: int = 1000) -> int:
+                # execute_values sends one statement per page and rowcount only covers the last, so page here
+                total = 0
+                for start in range(0, len(params), page_size):
+                    execute_values(cursor, sql, params[start:start + page_size], template=template, page_size=page_size)
+                    total += cursor.rowcount
+                return total
+
+            counts = {'repositories': written(_upsert_sql('repositories', REPOSITORY_COLUMNS, 'id', '%s'),
+                                              rows.repositories)}
+
+            # Snapshots are append-only, so stream them in with COPY. COPY can't skip
+            # conflicts, so it fills a staging table and a re-saved run is dropped on insert
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            for row in rows.snapshots:
+                writer.writerow(['' if value is None else value for value in row])
+            buffer.seek(0)
+            columns = ", ".join(SNAPSHOT_COLUMNS)
+            cursor.execute(f'CREATE TEMP TABLE snapshot_staging ON COMMIT DROP AS '
+                           f'SELECT {columns} FROM repository_snapshots WITH NO DATA')
+            cursor.copy_expert(f"COPY snapshot_staging ({columns}) FROM STDIN WITH (FORMAT csv, NULL '')", buffer)
+            cursor.execute(f'INSERT INTO repository_snapshots ({columns}) SELECT {columns} FROM snapshot_staging '
+                           'ON CONFLICT (repository_id, snapshot_date) DO NOTHING')
+            counts['repository_snapshots'] = cursor.rowcount
+
+            counts['contributors'] = written(_upsert_sql('contributors', CONTRIBUTOR_COLUMNS, 'id', '%s'),
+                                             rows.contributors)
+            counts['repository_contributors'] = written(
+                _upsert_sql('repository_contributors', REPOSITORY_CONTRIBUTOR_COLUMNS,
+                            'repository_id, contributor_id', '%s'), rows.repository_contributors)
+            counts['commits'] = written(_upsert_sql('commits', COMMIT_COLUMNS, 'sha', '%s'), rows.commits)
+            counts['transfer_events'] = written(
+                f'INSERT INTO transfer_events ({", ".join(TRANSFER_COLUMNS)}) '
+                f'SELECT v.* FROM (VALUES %s) AS v ({", ".join(TRANSFER_COLUMNS)}) '
+                'WHERE NOT EXISTS (SELECT 1 FROM transfer_events t WHERE t.repository_id = v.repository_id '
+                'AND t.new_owner = v.new_owner AND t.transfer_type = v.transfer_type)',
+                rows.transfers,
+                template='(%s::bigint, %s, %s, %s::timestamptz, %s, %s::decimal)'
+            )
+            counts['organization_activities'] = written(
+                _upsert_sql('organization_activities', ACTIVITY_COLUMNS, 'event_id', '%s', update=False),
+                rows.activities, template='(%s, %s, %s, %s, %s, %s::jsonb, %s)')
+            return counts
+
+    def close(self):
+        self.pool.closeall()
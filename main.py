@@ -4,13 +4,19 @@ GitHub M&A Intelligence System - Main Orchestrator
 Command-line interface for managing the complete M&A intelligence system
 """
 
+import time
+
+_IMPORT_STARTED = time.perf_counter()
+
 import os
 import sys
 import json
 import logging
 import argparse
-import subprocess
+from collections import defaultdict
+from contextlib import contextmanager
 from datetime import datetime
+from importlib.util import find_spec
 from pathlib import Path
 from dotenv import load_dotenv
 
@@ -28,10 +34,49 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Import name of each required distribution; probed without importing it
+REQUIRED_PACKAGES = {
+    'requests': 'requests', 'pandas': 'pandas', 'numpy': 'numpy', 'scikit-learn': 'sklearn',
+    'flask': 'flask', 'flask-cors': 'flask_cors', 'plotly': 'plotly', 'redis': 'redis', 'psycopg2': 'psycopg2'
+}
+OPTIONAL_PACKAGES = {
+    'tensorflow': 'tensorflow', 'pyarrow': 'pyarrow', 'orjson': 'orjson', 'httpx': 'httpx'
+}
+
+class PhaseProfiler:
+    """Wall-clock time of named CLI phases, reported with --profile
+
+    Time spent in a nested phase (e.g. imports inside a command) counts
+    toward that phase only, so the phases add up to the total
+    """
+
+    def __init__(self):
+        self.timings = defaultdict(float)
+        self._nested = []
+
+    @contextmanager
+    def phase(self, name: str):
+        start = time.perf_counter()
+        self._nested.append(0.0)
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self.timings[name] += elapsed - self._nested.pop()
+            if self._nested:
+                self._nested[-1] += elapsed
+
+    def report(self):
+        logger.info("Phase timings:")
+        for name, seconds in self.timings.items():
+            logger.info(f"  {name:<10} {seconds:8.3f}s")
+        logger.info(f"  {'total':<10} {sum(self.timings.values()):8.3f}s")
+
 class MAIntelligenceSystem:
     """Main system orchestrator"""
 
-    def __init__(self):
+    def __init__(self, profiler: PhaseProfiler = None):
+        self.profiler = profiler or PhaseProfiler()
         self.project_root = Path(__file__).parent
         self.data_dir = self.project_root / 'data'
         self.dashboard_dir = self.project_root / 'dashboard'
@@ -44,30 +89,18 @@ class MAIntelligenceSystem:
         """Check if all required dependencies are installed"""
         logger.info("Checking system dependencies...")
 
-        required_packages = [
-            'requests', 'pandas', 'numpy', 'scikit-learn', 'tensorflow',
-            'flask', 'flask_cors', 'plotly', 'redis', 'psycopg2'
-        ]
-
-        missing_packages = []
+        # find_spec locates a package without executing it, so this stays
+        # fast even for heavy packages
+        missing_packages = [name for name, module in REQUIRED_PACKAGES.items() if find_spec(module) is None]
+        missing_optional = [name for name, module in OPTIONAL_PACKAGES.items() if find_spec(module) is None]
 
-        for package in required_packages:
-            try:
-                __import__(package.replace('-', '_'))
-            except ImportError:
-                missing_packages.append(package)
+        if missing_optional:
+            logger.info(f"Optional packages not installed: {', '.join(missing_optional)}")
 
         if missing_packages:
             logger.error(f"Missing required packages: {', '.join(missing_packages)}")
-            logger.info("Installing missing packages...")
-            try:
-                subprocess.check_call([
-                    sys.executable, '-m', 'pip', 'install', '-r', 'requirements.txt'
-                ])
-                logger.info("Dependencies installed successfully")
-            except subprocess.CalledProcessError as e:
-                logger.error(f"Failed to install dependencies: {e}")
-                return False
+            logger.info("Install them with: pip install -r requirements.txt")
+            return False
 
         # Check for GitHub token
         if not os.getenv('GITHUB_TOKEN'):
@@ -120,45 +153,67 @@ class MAIntelligenceSystem:
         logger.info("Starting data collection...")
 
         try:
-            from github_data_collector import GitHubAPIClient, DataCollector
+            with self.profiler.phase('import'):
+                from github_data_collector import GitHubAPIClient, DataCollector
+                from github_events import load_watchlist
+                from github_state import CollectionState
+                from github_storage import CollectionStore
+                from github_snapshots import save_collection_snapshot
+
+            # High-water marks from earlier runs; --full collects everything again
+            state = CollectionState(os.getenv('COLLECTION_STATE_PATH', 'data/collection_state.json'))
+            if kwargs.get('full'):
+                state.reset()
 
             api_client = GitHubAPIClient()
-            collector = DataCollector(api_client)
+            collector = DataCollector(api_client, state)
 
-            # Collect repositories
+            # Collect repositories and contributor patterns
             min_stars = kwargs.get('min_stars', 10000)
-            repositories = collector.collect_top_repositories(min_stars=min_stars)
+            if kwargs.get('graphql'):
+                repositories, contributor_patterns = collector.collect_repositories_graphql(min_stars=min_stars)
+            else:
+                repositories = collector.collect_top_repositories(min_stars=min_stars)
+                contributor_patterns = collector.collect_contributor_patterns(repositories)
 
-            # Collect contributor patterns
-            contributor_patterns = collector.collect_contributor_patterns(repositories)
+            # Collect commits made since the last run
+            commit_activity = collector.collect_commit_activity(repositories)
 
             # Detect transfer events
             transfer_events = collector.detect_ownership_changes(repositories)
 
             # Collect organization activities
-            key_orgs = ['microsoft', 'google', 'meta', 'amazon', 'apple', 'netflix']
-            activities = collector.collect_recent_activity(key_orgs)
+            activities = collector.collect_recent_activity(load_watchlist())
 
             # Prepare data
             data = {
                 'timestamp': datetime.now().isoformat(),
                 'repositories': [vars(repo) for repo in repositories],
                 'contributor_patterns': {k: [vars(c) for c in v] for k, v in contributor_patterns.items()},
+                'commit_activity': {k: [vars(c) for c in v] for k, v in commit_activity.items()},
                 'transfer_events': [vars(event) for event in transfer_events],
                 'organization_activities': activities,
                 'metadata': {
                     'total_repositories': len(repositories),
                     'total_contributors_analyzed': sum(len(c) for c in contributor_patterns.values()),
+                    'new_commits': sum(len(c) for c in commit_activity.values()),
                     'transfer_events_detected': len(transfer_events),
                     'organizations_monitored': len(activities)
                 }
             }
 
             # Save data
-            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-            filename = f"data/{timestamp}_collected_data.json"
-            with open(filename, 'w') as f:
-                json.dump(data, f, indent=2, default=str)
+            save_collection_snapshot(data, 'collected_data')
+
+            # Upsert the run into the database too, when one is configured
+            store = CollectionStore.from_env()
+            if store:
+                try:
+                    store.save_collection(data)
+                except Exception as e:
+                    logger.error(f"Failed to persist collection to the database: {e}")
+                finally:
+                    store.close()
 
             logger.info(f"Data collection completed: {len(repositories)} repositories, {len(transfer_events)} transfers")
             return True
@@ -167,25 +222,49 @@ class MAIntelligenceSystem:
             logger.error(f"Data collection failed: {e}")
             return False
 
+    def ingest_events(self, **kwargs):
+        """Continuously ingest organization events into the event log"""
+        logger.info("Starting organization event ingestion...")
+
+        ingester = None
+        try:
+            with self.profiler.phase('import'):
+                from github_data_collector import GitHubAPIClient
+                from github_events import EventIngester, load_watchlist
+
+            organizations = kwargs.get('organizations') or load_watchlist()
+            ingester = EventIngester(GitHubAPIClient())
+
+            for org, events in ingester.stream(organizations):
+                logger.info(f"{org}: {len(events)} new events appended to {ingester.log.path}")
+
+        except KeyboardInterrupt:
+            logger.info(f"Event ingestion stopped: {ingester.stats()}" if ingester else "Event ingestion stopped")
+            return True
+        except Exception as e:
+            logger.error(f"Event ingestion failed: {e}")
+            return False
+
+        return True
+
     def run_analysis(self, **kwargs):
         """Run ML analysis"""
         logger.info("Starting ML analysis...")
 
         try:
-            from github_ml_analyzer import MLAnalyzer
+            with self.profiler.phase('import'):
+                from github_ml_analyzer import MLAnalyzer, ANALYSIS_COLUMNS
+                from github_snapshots import load_latest_collection
 
             analyzer = MLAnalyzer()
+            analyzer.load_historical_data(str(self.data_dir))
 
-            # Load latest data
-            data_files = list(self.data_dir.glob('*_collected_data.json'))
-            if not data_files:
+            # Load latest data, only the columns the analysis uses
+            current_data = load_latest_collection(str(self.data_dir), ANALYSIS_COLUMNS)
+            if current_data is None:
                 logger.error("No collected data found. Run data collection first.")
                 return False
 
-            latest_data_file = max(data_files, key=lambda x: x.stat().st_mtime)
-            with open(latest_data_file, 'r') as f:
-                current_data = json.load(f)
-
             # Run analysis
             results = analyzer.analyze_repository_data(current_data)
 
@@ -211,15 +290,14 @@ class MAIntelligenceSystem:
 
         try:
             # Import and run dashboard generation
-            from generate_dashboard import create_index_html, generate_overview_chart, generate_language_chart
+            with self.profiler.phase('import'):
+                from generate_dashboard import (create_index_html, generate_overview_chart, generate_language_chart,
+                                                DASHBOARD_COLUMNS)
+                from github_snapshots import load_latest_collection
 
             # Load latest data
-            data_files = list(self.data_dir.glob('*_collected_data.json'))
-            if data_files:
-                latest_data_file = max(data_files, key=lambda x: x.stat().st_mtime)
-                with open(latest_data_file, 'r') as f:
-                    data = json.load(f)
-
+            data = load_latest_collection(str(self.data_dir), DASHBOARD_COLUMNS)
+            if data is not None:
                 repos_data = data.get('repositories', [])
             else:
                 # Fallback to mock data
@@ -244,7 +322,8 @@ class MAIntelligenceSystem:
         logger.info("Starting API server...")
 
         try:
-            from github_api_server import app
+            with self.profiler.phase('import'):
+                from github_api_server import app
 
             host = kwargs.get('host', '0.0.0.0')
             port = kwargs.get('port', 5000)
@@ -333,20 +412,32 @@ def main():
 Examples:
   python main.py check                    # Run system health check
   python main.py collect --min-stars 5000 # Collect data from repos with 5k+ stars
+  python main.py collect --graphql        # Collect with batched GraphQL queries
+  python main.py collect --full           # Recollect everything, not just changes
+  python main.py events --orgs google,meta # Stream new organization events into the event log
   python main.py analyze                  # Run ML analysis on collected data
   python main.py dashboard                # Generate dashboard files
   python main.py api --port 8000          # Start API server on port 8000
   python main.py all                      # Run complete pipeline
+  python main.py all --profile            # Also report time spent per phase
         """
     )
 
     parser.add_argument('command', choices=[
-        'check', 'collect', 'analyze', 'dashboard', 'api', 'all'
+        'check', 'collect', 'events', 'analyze', 'dashboard', 'api', 'all'
     ], help='Command to execute')
 
     # Data collection options
     parser.add_argument('--min-stars', type=int, default=10000,
                        help='Minimum stars for repository collection (default: 10000)')
+    parser.add_argument('--graphql', action='store_true',
+                       help='Collect repositories and contributors with batched GraphQL queries')
+    parser.add_argument('--full', action='store_true',
+                       help='Ignore high-water marks from earlier runs and collect everything')
+
+    # Event ingestion options
+    parser.add_argument('--orgs', type=lambda value: [org.strip() for org in value.split(',') if org.strip()],
+                       help='Comma-separated organizations to ingest events for (default: the watchlist)')
 
     # API server options
     parser.add_argument('--host', default='0.0.0.0',
@@ -356,22 +447,35 @@ Examples:
     parser.add_argument('--debug', action='store_true',
                        help='Enable debug mode for API server')
 
+    # Profiling
+    parser.add_argument('--profile', action='store_true',
+                       help='Report wall-clock time per phase (import, collect, analyze, dashboard)')
+
     args = parser.parse_args()
 
-    system = MAIntelligenceSystem()
+    profiler = PhaseProfiler()
+    profiler.timings['import'] += time.perf_counter() - _IMPORT_STARTED
+    system = MAIntelligenceSystem(profiler)
 
     try:
         if args.command == 'check':
-            success = system.run_system_check()
+            with profiler.phase('check'):
+                success = system.run_system_check()
 
         elif args.command == 'collect':
-            success = system.collect_data(min_stars=args.min_stars)
+            with profiler.phase('collect'):
+                success = system.collect_data(min_stars=args.min_stars, graphql=args.graphql, full=args.full)
+
+        elif args.command == 'events':
+            success = system.ingest_events(organizations=args.orgs)
 
         elif args.command == 'analyze':
-            success = system.run_analysis()
+            with profiler.phase('analyze'):
+                success = system.run_analysis()
 
         elif args.command == 'dashboard':
-            success = system.generate_dashboard()
+            with profiler.phase('dashboard'):
+                success = system.generate_dashboard()
 
         elif args.command == 'api':
             system.start_api_server(
@@ -385,22 +489,30 @@ Examples:
             logger.info("Running complete M&A intelligence pipeline...")
 
             # Run system check
-            if not system.run_system_check():
+            with profiler.phase('check'):
+                passed = system.run_system_check()
+            if not passed:
                 logger.error("System check failed. Please fix issues before running pipeline.")
                 sys.exit(1)
 
             # Collect data
-            if not system.collect_data(min_stars=args.min_stars):
+            with profiler.phase('collect'):
+                collected = system.collect_data(min_stars=args.min_stars, graphql=args.graphql, full=args.full)
+            if not collected:
                 logger.error("Data collection failed.")
                 sys.exit(1)
 
             # Run analysis
-            if not system.run_analysis():
+            with profiler.phase('analyze'):
+                analyzed = system.run_analysis()
+            if not analyzed:
                 logger.error("ML analysis failed.")
                 sys.exit(1)
 
             # Generate dashboard
-            if not system.generate_dashboard():
+            with profiler.phase('dashboard'):
+                generated = system.generate_dashboard()
+            if not generated:
                 logger.error("Dashboard generation failed.")
                 sys.exit(1)
 
@@ -420,6 +532,9 @@ Examples:
     except Exception as e:
         logger.error(f"Unexpected error: {e}")
         sys.exit(1)
+    finally:
+        if args.profile:
+            profiler.report()
 
 if __name__ == '__main__':
     main()
\ No newline at end of file
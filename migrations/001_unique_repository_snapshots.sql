@@ -0,0 +1,13 @@
+-- One-off migration for PostgreSQL databases created before repository_snapshots
+-- was unique per (repository_id, snapshot_date): collection runs saved more than
+-- once left duplicate snapshots. Keeps one row of each and adds the unique index.
+-- Run once with: psql "$DATABASE_URL" -f migrations/001_unique_repository_snapshots.sql
+
+BEGIN;
+
+DELETE FROM repository_snapshots a USING repository_snapshots b
+WHERE a.repository_id = b.repository_id AND a.snapshot_date = b.snapshot_date AND a.id > b.id;
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_repository_snapshots_run ON repository_snapshots(repository_id, snapshot_date);
+
+COMMIT;
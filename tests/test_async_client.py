@@ -0,0 +1,84 @@
+import asyncio
+
+import httpx
+
+from github_async_client import AsyncGitHubAPIClient
+
+
+class ConditionalFeed:
+    """Mock GitHub endpoint that answers 304 when the client replays the current ETag"""
+
+    def __init__(self, body):
+        self.body = body
+        self.etag = '"v1"'
+        self.statuses = []
+
+    def set_body(self, body, etag):
+        self.body = body
+        self.etag = etag
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        if request.headers.get('If-None-Match') == self.etag:
+            self.statuses.append(304)
+            return httpx.Response(304, headers={'ETag': self.etag})
+        self.statuses.append(200)
+        return httpx.Response(200, json=self.body, headers={'ETag': self.etag})
+
+
+def make_client(handler) -> AsyncGitHubAPIClient:
+    client = AsyncGitHubAPIClient(token='test-token', base_url='https://api.github.test', http2=False)
+    client.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return client
+
+
+def test_not_modified_serves_cached_body():
+    repository = {'full_name': 'octo/repo', 'stargazers_count': 42}
+    feed = ConditionalFeed(repository)
+
+    async def fetch_twice():
+        async with make_client(feed) as client:
+            first = await client._make_request('https://api.github.test/repos/octo/repo')
+            second = await client._make_request('https://api.github.test/repos/octo/repo')
+            return first, second, client.validator_cache.stats()
+
+    first, second, stats = asyncio.run(fetch_twice())
+
+    assert feed.statuses == [200, 304]
+    assert first == repository
+    assert second == repository
+    assert stats['not_modified'] == 1
+
+
+def event(event_id):
+    return {'id': str(event_id), 'type': 'PushEvent', 'actor': {'login': 'octocat'},
+            'repo': {'name': 'octo/repo'}, 'payload': {}, 'created_at': '2026-01-01T00:00:00Z'}
+
+
+def test_event_polling_treats_not_modified_as_no_new_events(tmp_path, caplog):
+    from github_async_client import AsyncDataCollector
+    from github_events import EventIngester, EventLog
+    from github_state import CollectionState
+
+    feed = ConditionalFeed([event(2), event(1)])
+
+    async def poll_three_times():
+        async with make_client(feed) as client:
+            collector = AsyncDataCollector(client)
+            collector.event_ingester = EventIngester(client, log=EventLog(str(tmp_path / 'events.jsonl')),
+                                                     state=CollectionState(None),
+                                                     min_interval=1e-6, max_interval=1e-6)
+            first = await collector.collect_recent_activity(['octo'])
+            await asyncio.sleep(0.01)
+            unchanged = await collector.collect_recent_activity(['octo'])
+            await asyncio.sleep(0.01)
+            feed.set_body([event(3), event(2), event(1)], '"v2"')
+            changed = await collector.collect_recent_activity(['octo'])
+            return first, unchanged, changed
+
+    first, unchanged, changed = asyncio.run(poll_three_times())
+
+    assert feed.statuses == [200, 304, 200]
+    assert [e['id'] for e in first['octo']] == ['2', '1']
+    assert unchanged == {}
+    assert [e['id'] for e in changed['octo']] == ['3']
+    assert 'API request failed' not in caplog.text